@@ -32,8 +32,10 @@ from lisp.ui.settings.app_configuration import AppConfigurationDialog
 
 from aes67_monitor.poller import DaemonPoller
 from aes67_monitor.settings_page import Aes67Settings
+from aes67_monitor.state import DaemonState
 from aes67_monitor.stream_info_dialog.dialog import StreamInfoDialog
 from aes67_monitor.status_bar.indicator import StatusBarIndicator
+from aes67_monitor.transport import DaemonTransport
 
 class Aes67Monitor(Plugin):
     """Provides the ability to monitor AES67 connections"""
@@ -54,6 +56,9 @@ class Aes67Monitor(Plugin):
         AppConfigurationDialog.registerSettingsPage(
             'plugins.aes67_monitor', Aes67Settings, Aes67Monitor.Config)
 
+        self.state = DaemonState()
+        self.transport = DaemonTransport(self)
+
         self.poller = DaemonPoller(self)
         self.poller.add_callback('config', self._update_daemon_name)
 
@@ -66,6 +71,11 @@ class Aes67Monitor(Plugin):
         self._info_menu_action.triggered.connect(self._open_info_dialog)
         self.app.window.menuTools.addAction(self._info_menu_action)
 
+    def finalize(self):
+        self.poller.close()
+        self.transport.close()
+        super().finalize()
+
     @property
     def address(self):
         return compose_url(self.SCHEME, self.Config["daemon_ip"], self.Config["daemon_port"])
@@ -0,0 +1,99 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Times StreamInfoDelegate painting items, both directly and as frames of a
+list of 5k sources being scrolled.
+
+Usage: python benchmarks/bench_delegate.py
+'''
+
+import itertools
+
+from fixtures import StubPlugin, make_remote_sources
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtCore import QModelIndex, QRect
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QListView, QStyleOptionViewItem
+
+from aes67_monitor.stream_info_dialog.delegate import StreamInfoDelegate
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDirection
+
+
+STREAM_COUNT = 5000
+PAINT_COUNT = 1000
+
+def cases():
+    _app = QApplication.instance() or QApplication([])
+
+    model = StreamInfoModelTemplate(StubPlugin(), StreamDirection.SOURCE)
+    model.updateRemoteStreamsFromDaemon(make_remote_sources(STREAM_COUNT))
+
+    delegate = StreamInfoDelegate()
+    delegate.watch(model)
+
+    image = QImage(400, 48, QImage.Format_ARGB32_Premultiplied)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, image.width(), image.height())
+    option.font = QApplication.font()
+    option.fontMetrics = QApplication.fontMetrics()
+    option.palette = QApplication.palette()
+    indexes = [model.index(row, 0, QModelIndex()) for row in range(PAINT_COUNT)]
+
+    def paint():
+        painter = QPainter(image)
+        for index in indexes:
+            delegate.paint(painter, option, index)
+        painter.end()
+
+    yield BenchCase(f"delegate.paint x{PAINT_COUNT}", paint, PAINT_COUNT)
+
+    view = QListView()
+    view.setItemDelegate(delegate)
+    view.setModel(model)
+    view.setSpacing(delegate.margin)
+    view.setUniformItemSizes(True)
+    view.resize(400, 800)
+    view.show()
+
+    # Scrolls down, then back up, a quarter of a page each frame
+    scrollbar = view.verticalScrollBar()
+    step = scrollbar.pageStep() // 4
+    positions = itertools.cycle(
+        list(range(0, scrollbar.maximum(), step)) + list(range(scrollbar.maximum(), 0, -step))
+    )
+
+    def scroll_frame():
+        scrollbar.setValue(next(positions))
+        # Rendering to a pixmap paints the view even though it isn't on screen
+        view.viewport().grab()
+
+    yield BenchCase(f"delegate scroll frame (of {STREAM_COUNT})", scroll_frame, 1)
+
+if __name__ == '__main__':
+    run_cases(cases())
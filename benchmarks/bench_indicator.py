@@ -0,0 +1,121 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Times the status bar indicator aggregating the flags of every sink into its
+overall status (and tooltip), both as errors come and go on the same sinks and
+as they move from sink to sink; summarising the flags of every sink; and
+updating a status icon.
+
+Usage: python benchmarks/bench_indicator.py
+'''
+
+import logging
+
+from fixtures import make_sink_statuses, make_sinks
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtWidgets import QApplication
+
+from aes67_monitor.state import freeze
+from aes67_monitor.status_bar.icon import StatusIcon
+from aes67_monitor.status_bar.indicator import StatusBarIndicator
+from aes67_monitor.status_bar.sink_flags import SinkFlagTracker
+from aes67_monitor.status_bar.widget import StatusBarWidget
+from aes67_monitor.util import StatusEnum
+
+
+SINK_COUNTS = (10, 100, 1000)
+
+class _StubPlugin:
+    # pylint: disable=too-few-public-methods
+    poller = None
+
+def cases():
+    _app = QApplication.instance() or QApplication([])
+
+    # The indicator's logging is part of what's timed, but its output isn't wanted
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    for count in SINK_COUNTS:
+        indicator = StatusBarIndicator(_StubPlugin())
+        indicator._widget = StatusBarWidget() # pylint: disable=protected-access
+        indicator.update_sink_names(freeze({'sinks': make_sinks(count), 'sources': []}))
+
+        # Alternating between two sets of statuses, as if errors came and went
+        statuses = [freeze(make_sink_statuses(count, error_every)) for error_every in (10, 7)]
+
+        def update(indicator=indicator, statuses=statuses):
+            statuses.reverse()
+            indicator.update_sinks(statuses[0])
+
+        yield BenchCase(f"indicator update_sinks x{count}", update, count)
+
+        # Errors moving from sink to sink, so that flags are raised (and lowered) on every update: which
+        # needs a tracker that lowers flags at once, rather than once they've been lowered for a while
+        churning = [freeze(make_sink_statuses(count, error_every)) for error_every in (3, 4, 5, 7, 11)]
+        churning_indicator = StatusBarIndicator(_StubPlugin())
+        churning_indicator._widget = StatusBarWidget() # pylint: disable=protected-access
+        churning_indicator._sink_flags = SinkFlagTracker(lower_after=0) # pylint: disable=protected-access
+        churning_indicator.update_sink_names(freeze({'sinks': make_sinks(count), 'sources': []}))
+
+        def churn(indicator=churning_indicator, statuses=churning):
+            for sink_statuses in statuses:
+                indicator.update_sinks(sink_statuses)
+
+        yield BenchCase(f"indicator churn x{count}", churn, count * len(churning))
+
+        tracker = SinkFlagTracker()
+        tracker.update(statuses[0])
+
+        def aggregate(tracker=tracker):
+            tracker.severity()
+            tracker.flag_counts()
+            tracker.affected_sinks()
+
+        yield BenchCase(f"sink flags aggregate x{count}", aggregate, count)
+
+    # Shown, and with events processed after each update, so that any repaint is included
+    icon = StatusIcon()
+    icon.set_tooltip_header("Sinks:")
+    icon.show()
+    statuses = [{'status': status, 'tooltip': status.name} for status in (StatusEnum.NORMAL, StatusEnum.ERROR)]
+
+    def update_icon(icon=icon, status=statuses[0]):
+        icon.update(status)
+        QApplication.processEvents()
+
+    yield BenchCase("status icon unchanged", update_icon, 1)
+
+    def alternate_icon(icon=icon, statuses=statuses):
+        statuses.reverse()
+        icon.update(statuses[0])
+        QApplication.processEvents()
+
+    yield BenchCase("status icon alternating", alternate_icon, 1)
+
+if __name__ == '__main__':
+    run_cases(cases())
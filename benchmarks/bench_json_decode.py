@@ -0,0 +1,48 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Compares the available JSON decoders on `api/browse/sources/all` replies.
+
+Usage: python benchmarks/bench_json_decode.py
+'''
+
+from fixtures import make_remote_sources_reply
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.util import JSON_DECODERS
+
+
+SOURCE_COUNTS = (100, 1000, 10000)
+
+def cases():
+    for count in SOURCE_COUNTS:
+        body = make_remote_sources_reply(count)
+        for name, decoder in JSON_DECODERS.items():
+            yield BenchCase(f"json decode {name} x{count}", lambda decoder=decoder, body=body: decoder(body), count)
+
+if __name__ == '__main__':
+    run_cases(cases())
@@ -0,0 +1,81 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Times refreshing a StreamInfoModelTemplate with local and remote streams.
+
+Each size is timed: loading into an empty model; refreshing with unchanged
+streams (the usual case); and refreshing with a tenth of the streams replaced.
+
+Usage: python benchmarks/bench_model.py
+'''
+
+from fixtures import StubPlugin, make_local_sources, make_remote_sources
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtCore import QCoreApplication
+
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDirection
+
+
+STREAM_COUNTS = (10, 1000, 10000)
+
+def _update_cases(kind, make_streams, update):
+    plugin = StubPlugin()
+    for count in STREAM_COUNTS:
+        streams = make_streams(count)
+        # A tenth of the streams replaced by new ones
+        churned = streams[count // 10:] + make_streams(count // 10, count)
+
+        def initial_load(streams=streams):
+            update(StreamInfoModelTemplate(plugin, StreamDirection.SOURCE), streams)
+
+        model = StreamInfoModelTemplate(plugin, StreamDirection.SOURCE)
+        update(model, streams)
+
+        def steady_refresh(model=model, streams=streams):
+            update(model, streams)
+
+        def churned_refresh(model=model, streams=streams, churned=churned):
+            update(model, churned)
+            update(model, streams)
+
+        yield BenchCase(f"model {kind} initial x{count}", initial_load, count)
+        yield BenchCase(f"model {kind} steady x{count}", steady_refresh, count)
+        yield BenchCase(f"model {kind} churned x{count}", churned_refresh, 2 * count)
+
+def cases():
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    yield from _update_cases(
+        'local', make_local_sources, StreamInfoModelTemplate.updateLocalStreamsFromDaemon
+    )
+    yield from _update_cases(
+        'remote', make_remote_sources, StreamInfoModelTemplate.updateRemoteStreamsFromDaemon
+    )
+
+if __name__ == '__main__':
+    run_cases(cases())
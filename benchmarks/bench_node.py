@@ -0,0 +1,72 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Measures the memory used by, and the speed of `data()` on, StreamInfoNodes.
+
+Usage: python benchmarks/bench_node.py
+'''
+
+from fixtures import StubPlugin, make_local_sources
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtCore import Qt, QCoreApplication
+
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDataRole, StreamDirection, StreamInfoNode
+
+
+NODE_COUNT = 10000
+DATA_CALLS = 10000
+
+def cases():
+    _app = QCoreApplication.instance() or QCoreApplication([])
+
+    # The peak memory of this case, divided by NODE_COUNT, is the size of a node
+    yield BenchCase(
+        f"node create x{NODE_COUNT}",
+        lambda: [StreamInfoNode(None, StreamDirection.SOURCE, row) for row in range(NODE_COUNT)],
+        NODE_COUNT
+    )
+
+    model = StreamInfoModelTemplate(StubPlugin(), StreamDirection.SOURCE)
+    model.updateLocalStreamsFromDaemon(make_local_sources(NODE_COUNT))
+    node = model.children[-1]
+
+    for name, role in (
+        ('DisplayRole', Qt.DisplayRole),
+        ('NAME', StreamDataRole.NAME),
+        ('NAME (int)', StreamDataRole.NAME.value),
+        ('CH_COUNT', StreamDataRole.CH_COUNT),
+    ):
+        yield BenchCase(
+            f"node.data {name} x{DATA_CALLS}",
+            lambda role=role: [node.data(role) for _ in range(DATA_CALLS)],
+            DATA_CALLS
+        )
+
+if __name__ == '__main__':
+    run_cases(cases())
@@ -0,0 +1,80 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Times typing into a stream list's filter box: the filter and sort proxies
+wired as a StreamInfoGroup wires them, over 10k remote sources, both
+ungrouped and grouped by device. Each keystroke includes the list view
+laying out the rows it's left with.
+
+Usage: python benchmarks/bench_proxy.py
+'''
+
+from fixtures import StubPlugin, make_remote_sources
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtWidgets import QApplication, QListView
+
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDirection
+from aes67_monitor.stream_info_dialog.proxy import GroupBy, StreamFilterProxyModel, StreamSortProxyModel
+
+
+STREAM_COUNT = 10000
+
+# Narrowing to a single stream, and widening back out to every one
+KEYSTROKES = ('d', 'de', 'dev', 'device-1', 'device-12', 'device-123', 'device-1234', 'device-123', '')
+
+def cases():
+    app = QApplication.instance() or QApplication([])
+
+    model = StreamInfoModelTemplate(StubPlugin(), StreamDirection.SOURCE)
+    model.updateRemoteStreamsFromDaemon(make_remote_sources(STREAM_COUNT))
+
+    for group_by in (GroupBy.NOTHING, GroupBy.DEVICE):
+        sort_model = StreamSortProxyModel()
+        sort_model.setSourceModel(model)
+        sort_model.setGroupBy(group_by)
+        filter_model = StreamFilterProxyModel()
+        filter_model.setSourceModel(sort_model)
+
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setModel(filter_model)
+        view.resize(400, 600)
+        view.show()
+        app.processEvents()
+
+        def type_filter(filter_model=filter_model):
+            for text in KEYSTROKES:
+                filter_model.setFilterText(text)
+                app.processEvents()
+
+        name = 'ungrouped' if group_by == GroupBy.NOTHING else f"by {group_by.name.lower()}"
+        yield BenchCase(f"filter keystrokes {name} x{STREAM_COUNT}", type_filter, len(KEYSTROKES))
+
+if __name__ == '__main__':
+    run_cases(cases())
@@ -0,0 +1,61 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Times extracting the channel count from the SDPs of remote sources: parsing
+each SDP afresh, and (as usually happens) finding it already parsed.
+
+Usage: python benchmarks/bench_sdp.py
+'''
+
+from fixtures import make_sdp
+from harness import BenchCase, load_package, run_cases
+
+load_package()
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.sdp import SDP_CACHE_SIZE, parse_sdp
+
+
+SDP_COUNT = 1000
+
+def cases():
+    for padding in (0, 32):
+        sdps = [make_sdp(index, padding=padding) for index in range(SDP_COUNT)]
+        size = len(sdps[0])
+
+        def cold(sdps=sdps):
+            parse_sdp.cache_clear()
+            return [parse_sdp(sdp).rtpmap.channels for sdp in sdps]
+
+        def warm(sdps=sdps):
+            return [parse_sdp(sdp).rtpmap.channels for sdp in sdps]
+
+        yield BenchCase(f"sdp channels cold x{SDP_COUNT} ({size}B)", cold, SDP_COUNT)
+        # Warmed up by the harness's first call
+        yield BenchCase(f"sdp channels cached x{SDP_COUNT} ({size}B)", warm, SDP_COUNT)
+
+    assert SDP_COUNT <= SDP_CACHE_SIZE
+
+if __name__ == '__main__':
+    run_cases(cases())
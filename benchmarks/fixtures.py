@@ -0,0 +1,142 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Fabricated daemon data, shaped like the replies of the AES67 Daemon's API.
+'''
+
+import json
+
+# Names of the flags reported for each sink, in the order the daemon sends them
+SINK_FLAG_NAMES = (
+    'rtp_seq_id_error',
+    'rtp_ssrc_error',
+    'rtp_payload_type_error',
+    'rtp_sac_error',
+    'receiving_rtp_packet',
+    'some_muted',
+    'all_muted',
+    'muted',
+)
+
+LOCAL_DAEMON_NAME = 'local-daemon'
+LOCAL_ADDRESS = '10.255.255.1'
+
+
+class StubPlugin:
+    # pylint: disable=too-few-public-methods
+    daemon_name = LOCAL_DAEMON_NAME
+    ip = LOCAL_ADDRESS
+
+
+def make_sdp(index, channels=2, padding=0):
+    '''The SDP of a remote source; `padding` adds that many extra attribute lines.'''
+    return (
+        "v=0\n"
+        f"o=- {index} 0 IN IP4 10.0.{index // 250}.{index % 250 + 1}\n"
+        f"s=Device-{index} : Stream {index % 8}\n"
+        f"c=IN IP4 239.{(index // 250) % 256}.{index % 250}.1/15\n"
+        "t=0 0\n"
+        "a=clock-domain:PTPv2 0\n"
+        "m=audio 5004 RTP/AVP 98\n"
+        "c=IN IP4 239.69.0.1/15\n"
+        f"a=rtpmap:98 L24/48000/{channels}\n"
+        "a=sync-time:0\n"
+        "a=framecount:48\n"
+        "a=ptime:1\n"
+        "a=mediaclk:direct=0\n"
+        "a=ts-refclk:ptp=IEEE1588-2008:00-1D-C1-FF-FE-12-34-56:0\n"
+        + "".join(f"a=x-padding-{line}:{'0' * 64}\n" for line in range(padding))
+        + "a=recvonly\n"
+    )
+
+
+def make_remote_sources(count, offset=0, sdp_padding=0):
+    return [
+        {
+            'source': 'SAP',
+            'id': f"{index:016x}",
+            'name': f"Device-{index} : Stream {index % 8}",
+            'domain': '',
+            'address': f"10.0.{index // 250}.{index % 250 + 1}",
+            'sdp': make_sdp(index, padding=sdp_padding),
+            'last_seen': 1,
+            'announce_period': 30,
+        } for index in range(offset, offset + count)
+    ]
+
+
+def make_remote_sources_reply(count):
+    return json.dumps({'remote_sources': make_remote_sources(count)}).encode()
+
+
+def make_local_sources(count, offset=0):
+    return [
+        {
+            'id': index,
+            'enabled': True,
+            'name': f"Source {index}",
+            'io': 'Audio Device',
+            'max_samples_per_packet': 48,
+            'codec': 'L24',
+            'address': '',
+            'ttl': 15,
+            'payload_type': 98,
+            'dscp': 34,
+            'refclk_ptp_traceable': False,
+            'map': [index % 8 * 2, index % 8 * 2 + 1],
+        } for index in range(offset, offset + count)
+    ]
+
+
+def make_sinks(count, offset=0, sdp_padding=0):
+    return [
+        {
+            'id': index,
+            'name': f"Sink {index}",
+            'io': 'Audio Device',
+            'use_sdp': True,
+            'source': '',
+            'sdp': make_sdp(index, padding=sdp_padding),
+            'delay': 576,
+            'ignore_refclk_gmid': False,
+            'map': [index % 8 * 2, index % 8 * 2 + 1],
+        } for index in range(offset, offset + count)
+    ]
+
+
+def make_sink_status(receiving=True, errors=()):
+    '''The (decoded) status of one sink: receiving audio, with the given error flags set.'''
+    flags = {name: False for name in SINK_FLAG_NAMES}
+    flags['receiving_rtp_packet'] = receiving
+    for name in errors:
+        flags[name] = True
+    return {'sink_flags': flags, 'sink_min_time': 0}
+
+
+def make_sink_statuses(count, error_every=10):
+    '''The statuses of `count` sinks, keyed by id; every `error_every`th sink reporting an error.'''
+    return {
+        index: make_sink_status(errors=('rtp_seq_id_error',) if error_every and index % error_every == 0 else ())
+        for index in range(count)
+    }
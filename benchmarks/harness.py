@@ -0,0 +1,279 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Shared set-up, measurement and reporting for the benchmarks.
+
+Linux Show Player normally loads this plugin as the `aes67_monitor` package.
+Here the checkout is registered under that name directly, without running the
+package's `__init__` (which needs the rest of LiSP). If LiSP itself is not
+installed, the few parts of it the benchmarked modules import are stubbed.
+
+Each benchmark module provides a `cases()` generator of BenchCases. A case's
+`func` is one iteration, processing `ops` items (streams, calls, frames...).
+'''
+
+from collections import namedtuple
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# A case is re-run until it has been run this many times, and for at least this long
+MIN_RUNS = 5
+MAX_RUNS = 1000
+MIN_SECONDS = 0.5
+
+# Peak memory is the least seen over this many calls, so a one-off resize of a dict doesn't count
+MEMORY_RUNS = 3
+
+# How much slower (or larger) than its baseline a case may be before it's reported as a regression
+REGRESSION_THRESHOLD = 0.25
+LATENCY_TOLERANCE_MS = 0.05
+MEMORY_TOLERANCE_KIB = 64
+
+BenchCase = namedtuple('BenchCase', ('name', 'func', 'ops'))
+
+
+def load_package():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    stub_lisp()
+    if 'aes67_monitor' in sys.modules:
+        return
+    package = types.ModuleType('aes67_monitor')
+    package.__path__ = [REPO_ROOT]
+    sys.modules['aes67_monitor'] = package
+
+
+def _stub_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def stub_lisp():
+    '''Provides stand-ins for the parts of LiSP the plugin imports, if LiSP is not installed.'''
+    try:
+        import lisp # pylint: disable=import-outside-toplevel, unused-import
+        return
+    except ImportError:
+        pass
+
+    # pylint: disable=import-outside-toplevel, no-name-in-module, too-few-public-methods
+    from enum import Enum
+    import threading
+
+    from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+    from PyQt5.QtGui import QColor, QIcon, QPixmap
+    from PyQt5.QtWidgets import QWidget
+
+    class Clock(QTimer):
+        def __init__(self, timeout):
+            super().__init__()
+            self.setInterval(timeout)
+
+        def add_callback(self, callback):
+            self.timeout.connect(callback)
+            self.start()
+
+        def remove_callback(self, callback):
+            self.timeout.disconnect(callback)
+
+    def async_function(target):
+        def wrapped(*args, **kwargs):
+            threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True).start()
+        return wrapped
+
+    class Connection(Enum):
+        Direct = 1
+        QtQueued = 2
+
+    class _Invoker(QObject):
+        called = pyqtSignal(object)
+
+    class Signal:
+        # Queued connections call their slot from the thread the connection was made on (as in LiSP)
+        def __init__(self):
+            self._slots = []
+            self._invokers = []
+
+        def connect(self, slot, mode=Connection.Direct):
+            if mode == Connection.QtQueued:
+                invoker = _Invoker()
+                invoker.called.connect(lambda args, slot=slot: slot(*args), Qt.QueuedConnection)
+                self._invokers.append(invoker)
+                slot = lambda *args, invoker=invoker: invoker.called.emit(args)
+            self._slots.append(slot)
+
+        def emit(self, *args):
+            for slot in self._slots:
+                slot(*args)
+
+    class IconTheme:
+        # Like LiSP's, icons are looked up once and then cached (here, as a plain disc of colour)
+        _cache = {}
+
+        @staticmethod
+        def get(name):
+            if name not in IconTheme._cache:
+                pixmap = QPixmap(64, 64)
+                pixmap.fill(QColor.fromHsv(hash(name) % 360, 255, 255))
+                IconTheme._cache[name] = QIcon(pixmap)
+            return IconTheme._cache[name]
+
+    class Plugin:
+        Config = {}
+
+        def __init__(self, app):
+            self.app = app
+
+    _stub_module('lisp', __path__=[])
+    _stub_module('lisp.core', __path__=[])
+    _stub_module('lisp.core.clock', Clock=Clock)
+    _stub_module('lisp.core.decorators', async_function=async_function)
+    _stub_module('lisp.core.plugin', Plugin=Plugin)
+    _stub_module('lisp.core.signal', Connection=Connection, Signal=Signal)
+    _stub_module('lisp.core.util', compose_url=lambda schema, host, port, path='/': f"{schema}://{host}:{port}{path}")
+    _stub_module('lisp.ui', __path__=[])
+    _stub_module('lisp.ui.icons', IconTheme=IconTheme)
+    _stub_module('lisp.ui.mainwindow', MainStatusBar=type('MainStatusBar', (QWidget,), {}))
+    _stub_module('lisp.ui.settings', __path__=[])
+    _stub_module('lisp.ui.settings.app_configuration', AppConfigurationDialog=type('AppConfigurationDialog', (), {
+        'registerSettingsPage': staticmethod(lambda *args: None),
+    }))
+    _stub_module('lisp.ui.settings.pages', SettingsPage=type('SettingsPage', (QWidget,), {}))
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(func, ops=1):
+    '''
+    Calls `func` repeatedly, returning its throughput (ops per second), the
+    percentiles of its latency (in milliseconds) and the peak memory (in KiB)
+    allocated during a single call.
+    '''
+    func() # Warm up (caches, lazily created objects)
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_RUNS and (len(timings) < MIN_RUNS or time.perf_counter() - started < MIN_SECONDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    peaks = []
+    for _ in range(MEMORY_RUNS):
+        tracemalloc.start()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    peak = min(peaks)
+
+    timings.sort()
+    return {
+        'runs': len(timings),
+        'ops_per_sec': ops * len(timings) / sum(timings),
+        'min_ms': timings[0] * 1000,
+        'p50_ms': _percentile(timings, 0.50) * 1000,
+        'p95_ms': _percentile(timings, 0.95) * 1000,
+        'p99_ms': _percentile(timings, 0.99) * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file).get('cases', {})
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump({
+            'created': datetime.date.today().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cases': results,
+        }, baseline_file, indent=4, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def regressions(result, baseline):
+    '''
+    Returns which of a case's measurements are worse than its baseline by more than the threshold.
+
+    Latency is compared by the fastest run, being the least disturbed by
+    whatever else the machine was doing at the time.
+    '''
+    worse = []
+    # Timings of the smallest cases, and peak memory, vary from run to run: so small differences are ignored
+    if (result['min_ms'] > baseline['min_ms'] * (1 + REGRESSION_THRESHOLD)
+            and result['min_ms'] - baseline['min_ms'] > LATENCY_TOLERANCE_MS):
+        worse.append('latency')
+    if (result['peak_kib'] > baseline['peak_kib'] * (1 + REGRESSION_THRESHOLD)
+            and result['peak_kib'] - baseline['peak_kib'] > MEMORY_TOLERANCE_KIB):
+        worse.append('memory')
+    return worse
+
+
+def run_cases(cases, baseline=None):
+    '''Runs and reports a set of cases, returning their results by name (and any regressions).'''
+    baseline = load_baseline() if baseline is None else baseline
+    results = {}
+    regressed = {}
+
+    print(
+        f"{'case':<40} {'ops/s':>12} {'min ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9} "
+        f"{'vs base':>8}"
+    )
+    for case in cases:
+        result = measure(case.func, case.ops)
+        results[case.name] = result
+
+        change = ''
+        if case.name in baseline:
+            change = f"{result['min_ms'] / baseline[case.name]['min_ms'] - 1:+.0%}"
+            worse = regressions(result, baseline[case.name])
+            if worse:
+                regressed[case.name] = worse
+                change += ' !'
+
+        print(
+            f"{case.name:<40} {result['ops_per_sec']:>12,.0f} {result['min_ms']:>9.3f} {result['p50_ms']:>9.3f} "
+            f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['peak_kib']:>9.0f} {change:>8}"
+        )
+
+    for name, worse in regressed.items():
+        print(f"Regression: {name} ({', '.join(worse)})")
+    return results, regressed
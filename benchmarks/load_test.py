@@ -0,0 +1,248 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+Load tests of the poller and status bar indicator, against a mock daemon on
+localhost (see `mock_daemon.py`).
+
+Each scenario runs the plugin's own transport, poller (and poll engine) and
+indicator for a while against a daemon with a given fault injected, reporting
+how much polling was done, how often the state and indicator were updated (how
+long the indicator took, and how many of its icon updates changed nothing), the
+longest the GUI thread was kept busy, and what became of the requests (`faults`
+being those the mock daemon failed or reset on purpose, and `failed` those the
+transport saw fail). The transport's figures (failed, refused and connections)
+only cover the threaded poll engine: the asyncio engine makes its requests
+through its own session.
+
+These run for a set time rather than a set amount of work, so unlike the
+benchmarks they have no baseline.
+
+Usage: python benchmarks/load_test.py [--sinks 64] [--duration 5] [--scenario NAME] ...
+'''
+
+import argparse
+import json
+import logging
+import os
+import time
+
+from harness import REPO_ROOT, load_package
+from mock_daemon import MockDaemon
+
+load_package()
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from aes67_monitor.poller import DaemonPoller
+from aes67_monitor.state import DaemonState
+from aes67_monitor.status_bar.indicator import StatusBarIndicator
+from aes67_monitor.status_bar.widget import StatusBarWidget
+from aes67_monitor.transport import DaemonTransport
+
+
+# Faults injected into the mock daemon in each scenario
+SCENARIOS = {
+    'clean': {},
+    'latency': {'latency': 0.02, 'jitter': 0.02},
+    'errors': {'error_rate': 0.1},
+    'resets': {'reset_rate': 0.05},
+    'flag churn': {'flag_churn': 0.2},
+    'outage': {'reset_rate': 1.0},
+}
+
+# How long to wait (in seconds) for the run in flight at the end of a scenario
+LAST_RUN_TIMEOUT = 10
+
+# How often the GUI thread is checked for being kept busy (in milliseconds)
+STALL_PROBE_INTERVAL = 10
+
+
+class LoadTestPlugin:
+    '''Just enough of the plugin for its transport, poller and indicator to run.'''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, address, config):
+        self.Config = config # pylint: disable=invalid-name
+        self._address = address
+        self.state = DaemonState()
+        self.transport = DaemonTransport(self)
+        self.poller = DaemonPoller(self)
+
+    @property
+    def address(self):
+        return self._address
+
+    def close(self):
+        self.poller.close()
+        self.transport.close()
+
+
+def load_config(**overrides):
+    with open(os.path.join(REPO_ROOT, 'default.json'), encoding='utf-8') as config_file:
+        config = json.load(config_file)
+    config.update(overrides)
+    return config
+
+
+class StallProbe:
+    '''Measures how late a frequent timer fires: i.e. for how long the GUI thread was kept busy.'''
+
+    def __init__(self, interval=STALL_PROBE_INTERVAL):
+        self._interval = interval / 1000
+        self._last = None
+        self.worst = 0
+        self._timer = QTimer()
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _on_timeout(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self._last - self._interval)
+        self._last = now
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(app, mock, faults, args):
+    for fault, value in faults.items():
+        setattr(mock, fault, value)
+    mock.reset_stats()
+
+    plugin = LoadTestPlugin(mock.address, load_config(
+        daemon_port=mock.port,
+        poll_engine=args.engine,
+    ))
+
+    indicator = StatusBarIndicator(plugin)
+    widget = indicator._widget = StatusBarWidget() # pylint: disable=protected-access
+    timings = []
+
+    def update_sinks(sink_statuses):
+        start = time.perf_counter()
+        indicator.update_sinks(sink_statuses)
+        timings.append(time.perf_counter() - start)
+
+    plugin.poller.add_callback('ptp_status', indicator.update_ptp)
+    plugin.poller.add_callback('streams', indicator.update_sink_names)
+    plugin.poller.add_callback('sink_status', update_sinks)
+    plugin.poller.add_poll_callback('sink_status', indicator.sinks_polled)
+
+    # Poll every endpoint at the rate asked for, not just at the rate the indicator would
+    for what in ('config', 'ptp_status', 'remote_sources', 'sink_status', 'streams'):
+        plugin.poller.add_callback(what, lambda _value: None, args.interval)
+
+    probe = StallProbe()
+    probe.start()
+    QTimer.singleShot(int(args.duration * 1000), app.quit)
+    app.exec_()
+    probe.stop()
+
+    plugin.poller.close()
+    # Let the last run finish (and deliver) before its transport is closed
+    deadline = time.monotonic() + LAST_RUN_TIMEOUT
+    while plugin.poller._run_lock.locked() and time.monotonic() < deadline: # pylint: disable=protected-access
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+    stats = plugin.transport.stats()
+    served = mock.stats()
+    plugin.close()
+    for fault in faults:
+        setattr(mock, fault, 0.0)
+    mock.error_status = 500
+
+    timings.sort()
+    return {
+        'requests_per_sec': sum(count for kind, count in served.items() if kind != 'flag_flip') / args.duration,
+        'state_updates': plugin.state.version,
+        'indicator_updates': len(timings),
+        'indicator_p50_ms': _percentile(timings, 0.5) * 1000,
+        'indicator_max_ms': (timings[-1] if timings else 0) * 1000,
+        'avoided_repaints': widget.avoided_repaints,
+        'gui_stall_ms': probe.worst * 1000,
+        'dropped_ticks': plugin.poller.dropped_ticks,
+        'failures': stats['failures'],
+        'refused': stats['refused'],
+        'breaker': stats['breaker'],
+        'connections': stats['connections_opened'],
+        'faults': served.get('error', 0) + served.get('reset', 0),
+        'flag_flips': served.get('flag_flip', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--remote-sources', type=int, default=1000)
+    parser.add_argument('--local-sources', type=int, default=16)
+    parser.add_argument('--sinks', type=int, default=64)
+    parser.add_argument('--sdp-padding', type=int, default=0, help="extra attribute lines in each SDP")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds to run each scenario for")
+    parser.add_argument('--interval', type=int, default=250, help="milliseconds between polls of each endpoint")
+    parser.add_argument('--engine', default='threaded', help="the poll engine to use")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="run only this scenario (may be repeated)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    # The indicator logs each error flag it sees: that's part of the load, but its output isn't wanted
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    mock = MockDaemon(args.remote_sources, args.local_sources, args.sinks, args.sdp_padding).start()
+    print(
+        f"{args.sinks} sinks, {args.local_sources} local sources, {args.remote_sources} remote sources; "
+        f"polling every {args.interval} ms for {args.duration:g} s with the {args.engine} engine\n"
+    )
+    print(
+        f"{'scenario':<12} {'req/s':>8} {'updates':>8} {'ind upd':>8} {'ind p50':>8} {'ind max':>8} {'no-ops':>7} "
+        f"{'stall ms':>9} {'dropped':>8} {'faults':>7} {'failed':>7} {'refused':>8} {'breaker':>10} {'conns':>6} {'flips':>6}"
+    )
+    try:
+        for name in args.scenario or SCENARIOS:
+            result = run_scenario(app, mock, SCENARIOS[name], args)
+            print(
+                f"{name:<12} {result['requests_per_sec']:>8,.0f} {result['state_updates']:>8} "
+                f"{result['indicator_updates']:>8} {result['indicator_p50_ms']:>8.2f} "
+                f"{result['indicator_max_ms']:>8.2f} {result['avoided_repaints']:>7} {result['gui_stall_ms']:>9.1f} {result['dropped_ticks']:>8} "
+                f"{result['faults']:>7} {result['failures']:>7} {result['refused']:>8} {result['breaker']:>10} "
+                f"{result['connections']:>6} {result['flag_flips']:>6}"
+            )
+    finally:
+        mock.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+A stand-in for the AES67 Daemon, answering the same API on localhost.
+
+It serves fabricated streams, remote sources and sink statuses (in numbers and
+sizes given when it's made), accepts the PUT and DELETE requests used to edit
+local sources and sinks, and can be told to misbehave: slowing its replies,
+failing requests, resetting connections, and flipping the flags of sinks.
+
+The faults may be changed whilst it's running, e.g. `daemon.reset_rate = 1.0`
+to take it "off the network" part way through a test.
+
+Usage: python benchmarks/mock_daemon.py [--port 8080] [--sinks 64] ...
+
+then point the plugin at it (by default it listens where the plugin looks).
+'''
+
+import argparse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import socket
+import struct
+from threading import Lock, Thread
+import time
+
+from fixtures import (
+    LOCAL_ADDRESS,
+    SINK_FLAG_NAMES,
+    make_local_sources,
+    make_remote_sources,
+    make_sink_status,
+    make_sinks,
+)
+from harness import load_package
+
+load_package()
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.util import API_PATHS
+
+
+NODE_ID = 'AES67 daemon mock'
+
+# Linger enabled with a timeout of zero: closing the socket sends a RST
+_RESET_LINGER = struct.pack('ii', 1, 0)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, as the daemon (and the plugin's connection pool) uses
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockAES67Daemon'
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self): # pylint: disable=invalid-name
+        self._handle('GET')
+
+    def do_PUT(self): # pylint: disable=invalid-name
+        self._handle('PUT')
+
+    def do_DELETE(self): # pylint: disable=invalid-name
+        self._handle('DELETE')
+
+    def _handle(self, method):
+        mock = self.server.mock
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        status, reply = mock.handle(method, self.path.lstrip('/'), body)
+        if status is None:
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _RESET_LINGER)
+            self.close_connection = True
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json' if status == 200 else 'text/plain')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+
+class MockDaemon:
+    '''
+    A fabricated daemon: `remote_sources` sources seen on the network, and
+    `local_sources` and `sinks` of its own, the SDPs of each padded by
+    `sdp_padding` extra lines.
+
+    Faults, each of which may be changed at any time:
+      - `latency` (plus up to `jitter`) seconds before every reply;
+      - `error_rate`, the chance of a request failing with `error_status`;
+      - `reset_rate`, the chance of a connection being reset instead of answered;
+      - `flag_churn`, the chance of one of a sink's flags flipping each time its
+        status is requested.
+
+    Random choices are made from `seed`, so a run can be repeated.
+    '''
+
+    def __init__(self, remote_sources=100, local_sources=8, sinks=16, sdp_padding=0, seed=0):
+        # pylint: disable=too-many-arguments
+        self.latency = 0.0
+        self.jitter = 0.0
+        self.error_rate = 0.0
+        self.error_status = 500
+        self.reset_rate = 0.0
+        self.flag_churn = 0.0
+
+        self._lock = Lock()
+        self._random = random.Random(seed)
+        self._server = None
+        self._thread = None
+
+        self._sources = {source['id']: source for source in make_local_sources(local_sources)}
+        self._sinks = {sink['id']: sink for sink in make_sinks(sinks, sdp_padding=sdp_padding)}
+        self._sink_statuses = {sink_id: make_sink_status() for sink_id in self._sinks}
+        self._streams_body = None
+
+        self._replies = {
+            API_PATHS['config']: self._encode({
+                'node_id': NODE_ID,
+                'ip_addr': LOCAL_ADDRESS,
+                'interface_name': 'lo',
+                'http_port': 8080,
+                'sample_rate': 48000,
+                'playout_delay': 0,
+                'ptp_domain': 0,
+            }),
+            API_PATHS['ptp_status']: self._encode({
+                'status': 'locked',
+                'gmid': '00-1D-C1-FF-FE-12-34-56',
+                'jitter': 0,
+            }),
+            API_PATHS['remote_sources']: self._encode({
+                'remote_sources': make_remote_sources(remote_sources, sdp_padding=sdp_padding),
+            }),
+        }
+
+        self._hits = Counter()
+
+    @staticmethod
+    def _encode(value):
+        return json.dumps(value).encode()
+
+    @property
+    def address(self):
+        '''The address of the running server, as the plugin would compose it.'''
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self, host='127.0.0.1', port=0):
+        '''Starts serving from a background thread; a port of 0 picks a free one.'''
+        self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = Thread(target=self._server.serve_forever, name='mock_daemon', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+
+    def stats(self):
+        '''How many requests were made of each kind, and how many faults were injected.'''
+        with self._lock:
+            return dict(self._hits)
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits.clear()
+
+    def _roll(self, rate):
+        return rate > 0 and self._random.random() < rate
+
+    def handle(self, method, path, body):
+        '''Returns the status and body of the reply to a request, or a status of None to reset the connection.'''
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if self._roll(self.reset_rate):
+                self._hits['reset'] += 1
+                fault = 'reset'
+            elif self._roll(self.error_rate):
+                self._hits['error'] += 1
+                fault = 'error'
+            else:
+                fault = None
+
+        if delay:
+            time.sleep(delay)
+        if fault == 'reset':
+            return None, b''
+        if fault == 'error':
+            return self.error_status, b'Injected failure'
+
+        with self._lock:
+            if method == 'GET':
+                return self._get(path)
+            return self._edit(method, path, body)
+
+    def _get(self, path):
+        if path in self._replies:
+            self._hits[path] += 1
+            return 200, self._replies[path]
+
+        if path == API_PATHS['streams']:
+            self._hits[path] += 1
+            if self._streams_body is None:
+                self._streams_body = self._encode({
+                    'sources': [self._sources[stream_id] for stream_id in sorted(self._sources)],
+                    'sinks': [self._sinks[stream_id] for stream_id in sorted(self._sinks)],
+                })
+            return 200, self._streams_body
+
+        prefix = API_PATHS['sink_status']
+        if path.startswith(prefix):
+            self._hits[prefix] += 1
+            status = self._sink_statuses.get(self._stream_id(path[len(prefix):]))
+            if status is None:
+                return 404, b'Sink not found'
+            if self._roll(self.flag_churn):
+                flag = self._random.choice(SINK_FLAG_NAMES)
+                status['sink_flags'][flag] = not status['sink_flags'][flag]
+                self._hits['flag_flip'] += 1
+            return 200, self._encode(status)
+
+        return 404, b'Not found'
+
+    def _edit(self, method, path, body):
+        for what, streams in (('source_edit', self._sources), ('sink_edit', self._sinks)):
+            prefix = API_PATHS[what]
+            if not path.startswith(prefix):
+                continue
+            stream_id = self._stream_id(path[len(prefix):])
+            if stream_id is None:
+                return 400, b'Invalid id'
+
+            self._hits[f"{method} {prefix}"] += 1
+            if method == 'DELETE':
+                if streams.pop(stream_id, None) is None:
+                    return 404, b'Stream not found'
+                if streams is self._sinks:
+                    del self._sink_statuses[stream_id]
+            else:
+                try:
+                    definition = json.loads(body)
+                except ValueError:
+                    return 400, b'Invalid JSON'
+                streams[stream_id] = {**definition, 'id': stream_id}
+                if streams is self._sinks and stream_id not in self._sink_statuses:
+                    self._sink_statuses[stream_id] = make_sink_status()
+
+            self._streams_body = None
+            return 200, b''
+
+        return 404, b'Not found'
+
+    @staticmethod
+    def _stream_id(text):
+        try:
+            return int(text)
+        except ValueError:
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--remote-sources', type=int, default=100)
+    parser.add_argument('--local-sources', type=int, default=8)
+    parser.add_argument('--sinks', type=int, default=16)
+    parser.add_argument('--sdp-padding', type=int, default=0, help="extra attribute lines in each SDP")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds before every reply")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many more seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--reset-rate', type=float, default=0.0)
+    parser.add_argument('--flag-churn', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockDaemon(args.remote_sources, args.local_sources, args.sinks, args.sdp_padding, args.seed)
+    for fault in ('latency', 'jitter', 'error_rate', 'error_status', 'reset_rate', 'flag_churn'):
+        setattr(mock, fault, getattr(args, fault))
+
+    mock.start(args.host, args.port)
+    print(f"Mock AES67 Daemon listening at {mock.address} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
+
+if __name__ == '__main__':
+    main()
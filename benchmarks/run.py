@@ -0,0 +1,86 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Runs every benchmark, comparing each with its saved baseline (if any).
+
+Usage: python benchmarks/run.py [--save-baseline] [--match TEXT]
+
+With --save-baseline the results are saved as the new baseline. Otherwise
+the exit status is non-zero if any case has regressed.
+'''
+
+import argparse
+import sys
+
+from harness import load_baseline, run_cases, save_baseline
+
+import bench_delegate
+import bench_indicator
+import bench_json_decode
+import bench_model
+import bench_node
+import bench_proxy
+import bench_sdp
+
+BENCHMARKS = (
+    bench_model,
+    bench_node,
+    bench_delegate,
+    bench_proxy,
+    bench_sdp,
+    bench_json_decode,
+    bench_indicator,
+)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save-baseline', action='store_true', help="save the results as the new baseline")
+    parser.add_argument('--match', default='', help="only run the cases whose name contains this")
+    args = parser.parse_args()
+
+    baseline = {} if args.save_baseline else load_baseline()
+    results = {}
+    regressed = {}
+    for benchmark in BENCHMARKS:
+        cases = (case for case in benchmark.cases() if args.match in case.name)
+        module_results, module_regressed = run_cases(cases, baseline)
+        results.update(module_results)
+        regressed.update(module_regressed)
+        print()
+
+    if args.save_baseline:
+        if args.match:
+            # Only update the cases that were run
+            results = {**load_baseline(), **results}
+        save_baseline(results)
+        print(f"Saved a baseline of {len(results)} cases.")
+        return 0
+
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed.")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+import logging
+import random
+import time
+from enum import Enum
+from threading import Lock
+
+logger = logging.getLogger(__name__) # pylint: disable=invalid-name
+
+
+class BreakerState(Enum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitBreaker:
+    '''
+    Stops requests being made to a daemon that isn't answering.
+
+    After `failure_threshold` consecutive failures the breaker opens, and
+    requests are refused without being attempted. Once a backoff delay has
+    passed, a single probe request is let through (half-open): if it succeeds
+    the breaker closes again, otherwise it reopens with the delay doubled (up
+    to `max_delay`). Delays are randomised by +/- `jitter` so that several
+    clients don't retry in lockstep.
+    '''
+
+    def __init__(self, name, failure_threshold=3, base_delay=1.0, max_delay=30.0, jitter=0.2,
+                 clock=time.monotonic):
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._clock = clock
+
+        self._lock = Lock()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._reopen_count = 0
+        self._retry_at = 0
+        self._probing = False
+
+    @property
+    def state(self):
+        return self._state
+
+    def _open(self):
+        delay = min(self._max_delay, self._base_delay * 2 ** self._reopen_count)
+        delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+        self._retry_at = self._clock() + delay
+        self._reopen_count += 1
+        self._state = BreakerState.OPEN
+        logger.debug(f"AES67 Daemon at {self._name} not answering, retrying in {delay:.1f}s")
+
+    def allow_request(self):
+        '''Whether a request may be attempted now. Must be followed by a call to `record`.'''
+        with self._lock:
+            if self._state == BreakerState.CLOSED:
+                return True
+
+            if self._state == BreakerState.OPEN and self._clock() >= self._retry_at:
+                self._state = BreakerState.HALF_OPEN
+
+            if self._state == BreakerState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            return False
+
+    def record(self, success):
+        with self._lock:
+            self._probing = False
+
+            if success:
+                if self._state != BreakerState.CLOSED:
+                    logger.debug(f"AES67 Daemon at {self._name} answering again")
+                self._state = BreakerState.CLOSED
+                self._failures = 0
+                self._reopen_count = 0
+                return
+
+            if self._state == BreakerState.OPEN:
+                # A request that was already in flight when the breaker opened
+                return
+
+            self._failures += 1
+            if self._state == BreakerState.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._open()
@@ -0,0 +1,88 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from threading import Lock
+
+from lisp.core.signal import Connection, Signal
+
+
+class ResultDelivery:
+    '''
+    Hands poll results over from the poller's thread to the GUI thread.
+
+    Results are posted from the poller's thread and held until `flush` is
+    called (once per run). This queues a single call on the GUI thread, which
+    then applies every held result in one batch - so widgets are updated (and
+    repainted) at most once per run.
+
+    If a newer result for an endpoint is posted before the older one has been
+    delivered, only the newer one is delivered.
+
+    Endpoints may also be marked as polled, whether or not their result
+    changed: `polled` is then called with them, after the results are applied.
+    '''
+
+    def __init__(self, apply, polled=None):
+        self._apply = apply
+        self._on_polled = polled
+        self._lock = Lock()
+        self._pending = {}
+        self._polled = set()
+        self._coalesced = 0
+
+        # Must be created on the GUI thread, so that queued calls are made there
+        self._flush_requested = Signal()
+        self._flush_requested.connect(self._deliver, Connection.QtQueued)
+
+    @property
+    def coalesced(self):
+        '''How many results were superseded before they could be delivered.'''
+        return self._coalesced
+
+    def post(self, what, reply):
+        with self._lock:
+            if what in self._pending:
+                self._coalesced += 1
+            self._pending[what] = reply
+
+    def mark_polled(self, what):
+        if self._on_polled is None:
+            return
+        with self._lock:
+            self._polled.add(what)
+
+    def flush(self):
+        with self._lock:
+            if not self._pending and not self._polled:
+                return
+        self._flush_requested.emit()
+
+    def _deliver(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            polled, self._polled = self._polled, set()
+        if pending:
+            self._apply(pending)
+        if polled:
+            self._on_polled(polled)
@@ -0,0 +1,174 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+import asyncio
+import logging
+from threading import Thread
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None # pylint: disable=invalid-name
+
+from lisp.core.decorators import async_function
+
+from .util import make_api_url
+
+logger = logging.getLogger(__name__) # pylint: disable=invalid-name
+
+
+class ThreadedPollEngine:
+    '''Polls from a new thread each run, making blocking requests one after another.'''
+
+    def __init__(self, poller, transport):
+        self._poller = poller
+        self._transport = transport
+
+    def _fetch(self, what):
+        if what != 'sink_status':
+            reply = self._transport.get(what)
+            return reply.content if reply else None
+
+        sink_ids = self._poller.sink_ids_to_poll()
+        if sink_ids is None:
+            return None
+
+        replies = self._transport.get_many('sink_status', sink_ids)
+        return {sink_id: reply.content if reply else None for sink_id, reply in replies.items()}
+
+    @async_function
+    def run(self, due, finished):
+        try:
+            for what in due:
+                sequence = self._poller.next_sequence()
+                self._poller.deliver(what, sequence, self._fetch(what))
+        finally:
+            finished()
+
+    def close(self):
+        pass
+
+
+class AsyncioPollEngine:
+    '''
+    Polls from a single, long-lived, thread running an asyncio event loop.
+
+    All the requests of a run - including those for the status of each sink -
+    are made concurrently, each endpoint being delivered as soon as its reply
+    arrives. Requests share the circuit breaker of the plugin's transport.
+    '''
+
+    def __init__(self, poller, transport, config):
+        self._poller = poller
+        self._transport = transport
+        self._concurrency = config['request_concurrency']
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=config['connect_timeout'],
+            sock_read=config['read_timeout']
+        )
+
+        self._loop = None
+        self._session = None
+
+    @staticmethod
+    def _run_loop(loop):
+        loop.run_forever()
+        loop.close()
+
+    def _start_loop(self):
+        self._loop = asyncio.new_event_loop()
+        Thread(target=self._run_loop, args=(self._loop,), name='aes67_poller', daemon=True).start()
+
+    async def _get(self, what, opt_arg=None):
+        url = make_api_url(self._transport.address, what, opt_arg)
+        if not url:
+            return None
+
+        breaker = self._transport.breaker
+        if not breaker.allow_request():
+            return None
+
+        try:
+            async with self._session.get(url) as response:
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record(False)
+            return None
+
+        breaker.record(True)
+        return body if response.ok else None
+
+    async def _fetch(self, what):
+        if what != 'sink_status':
+            return await self._get(what)
+
+        sink_ids = self._poller.sink_ids_to_poll()
+        if sink_ids is None:
+            return None
+
+        bodies = await asyncio.gather(*(self._get('sink_status', sink_id) for sink_id in sink_ids))
+        return dict(zip(sink_ids, bodies))
+
+    async def _poll(self, what):
+        sequence = self._poller.next_sequence()
+        self._poller.deliver(what, sequence, await self._fetch(what))
+
+    async def _run(self, due, finished):
+        try:
+            if self._session is None:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self._concurrency),
+                    timeout=self._timeout
+                )
+            await asyncio.gather(*(self._poll(what) for what in due))
+        finally:
+            finished()
+
+    def run(self, due, finished):
+        if self._loop is None:
+            self._start_loop()
+        asyncio.run_coroutine_threadsafe(self._run(due, finished), self._loop)
+
+    async def _close_session(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_session(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+def create_poll_engine(name, poller, plugin):
+    if name == 'asyncio':
+        if aiohttp is not None:
+            return AsyncioPollEngine(poller, plugin.transport, plugin.Config)
+        logger.warning(
+            "The asyncio poll engine needs aiohttp, which is not installed. "
+            "Falling back to the threaded poll engine."
+        )
+    return ThreadedPollEngine(poller, plugin.transport)
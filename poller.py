@@ -22,58 +22,288 @@
 
 # pylint: disable=missing-docstring
 
-import requests
+import hashlib
+from itertools import count
+from threading import Lock
+from types import MappingProxyType
 
 from lisp.core.clock import Clock
-from lisp.core.decorators import async_function
 
-from .util import API_PATHS, make_api_get_request
+from .breaker import BreakerState
+from .delivery import ResultDelivery
+from .poll_engine import create_poll_engine
+from .scheduler import PollPriority, PollScheduler
+from .sink_planner import SinkPollPlanner
+from .state import freeze
+from .util import API_PATHS, get_json_decoder
 
 
+TICK_INTERVAL = 250 # milliseconds
 UPDATE_INTERVAL = 2000 # milliseconds
 
+# Default polling interval (in milliseconds) and priority for each endpoint.
+# Callbacks may ask for an endpoint to be polled more often when registering.
+POLL_RATES = {
+    'config': (10000, PollPriority.LOW),
+    'ptp_status': (500, PollPriority.HIGH),
+    'remote_sources': (5000, PollPriority.LOW),
+    'sink_status': (UPDATE_INTERVAL, PollPriority.NORMAL),
+    'streams': (UPDATE_INTERVAL, PollPriority.NORMAL),
+}
+
+def fingerprint(body):
+    if body is None:
+        return None
+    return hashlib.blake2b(body, digest_size=16).digest()
+
 class DaemonPoller:
+    '''
+    Polls the daemon, keeping the plugin's `DaemonState` up to date.
+
+    Callbacks are subscribed to the matching key of the state, and set how often
+    each endpoint is polled. The state is only updated when a reply differs from
+    the last one (and with None whilst the daemon is unreachable).
+    '''
 
     def __init__(self, plugin):
         self._plugin = plugin
-        self._clock = Clock(UPDATE_INTERVAL)
+        self._state = plugin.state
+        self._clock = Clock(TICK_INTERVAL)
         self._clock_started = False
+        self._scheduler = PollScheduler(TICK_INTERVAL)
         self._callbacks = {}
+        self._poll_callbacks = {}
+
+        self._lock = Lock()
+        self._fingerprints = {}
+        self._decode_json = get_json_decoder(plugin.Config['json_decoder'])
+
+        self._run_lock = Lock()
+        self._held_over = set()
+        self._dropped_ticks = 0
+        self._sequence = count()
+        self._delivered = {}
+
+        self._sink_planner = SinkPollPlanner(UPDATE_INTERVAL, plugin.Config['sink_poll_budget'])
+        self._planned_streams = None
+        self._sink_ids = {}
+        self._sink_digests = {}
+        self._sink_statuses = {}
+        self._sinks_changed = False
+        self._sink_generation = 0
 
-    def add_callback(self, what, callback):
+        self._delivery = ResultDelivery(self._state.update, self._polled)
+        self._engine = create_poll_engine(plugin.Config['poll_engine'], self, plugin)
+
+    def close(self):
+        if self._clock_started:
+            self._clock.remove_callback(self._on_tick)
+            self._clock_started = False
+        self._engine.close()
+
+    @property
+    def dropped_ticks(self):
+        '''How many ticks found a previous run still in flight.'''
+        return self._dropped_ticks
+
+    def add_callback(self, what, callback, interval=None):
         if what not in API_PATHS:
             return
 
+        default_interval, priority = POLL_RATES.get(what, (UPDATE_INTERVAL, PollPriority.NORMAL))
+        interval = interval or default_interval
+
         if what not in self._callbacks:
-            self._callbacks[what] = []
-        elif callback in self._callbacks[what]:
+            self._callbacks[what] = {}
+            # Don't keep a new subscriber waiting for the endpoint's scheduled slot
+            self._held_over.add(what)
+        elif self._callbacks[what].get(callback) == interval:
             return
 
-        self._callbacks[what].append(callback)
+        self._callbacks[what][callback] = interval
+        self._schedule(what, priority)
+        self._state.subscribe(what, callback)
 
         if not self._clock_started:
             self._clock_started = True
-            self._clock.add_callback(self.run)
+            self._clock.add_callback(self._on_tick)
 
     def remove_callback(self, what, callback):
         if what not in API_PATHS or what not in self._callbacks or callback not in self._callbacks[what]:
             return
 
-        self._callbacks[what].remove(callback)
+        del self._callbacks[what][callback]
+        self._state.unsubscribe(what, callback)
 
-        if not self._callbacks[what]:
+        if self._callbacks[what]:
+            _, priority = POLL_RATES.get(what, (UPDATE_INTERVAL, PollPriority.NORMAL))
+            self._schedule(what, priority)
+        else:
             del self._callbacks[what]
+            self._scheduler.unschedule(what)
 
         if not self._callbacks:
-            self._clock.remove_callback(self.run)
+            self._clock.remove_callback(self._on_tick)
             self._clock_started = False
 
-    @async_function
-    def run(self):
-        with requests.Session() as session:
-            address = self._plugin.address
-            for what, callbacks in self._callbacks.items():
-                reply = make_api_get_request(session, address, what)
-                reply = reply.json() if reply else None
-                for cb in callbacks:
-                    cb(reply)
+    def add_poll_callback(self, what, callback):
+        '''
+        Calls `callback` (with no arguments) after each run that polled an endpoint, whether or not its data changed.
+
+        This doesn't make the endpoint polled: that's up to the callbacks added with `add_callback`.
+        '''
+        callbacks = self._poll_callbacks.setdefault(what, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def remove_poll_callback(self, what, callback):
+        callbacks = self._poll_callbacks.get(what, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _polled(self, endpoints):
+        for what in endpoints:
+            for callback in list(self._poll_callbacks.get(what, ())):
+                callback()
+
+    def _schedule(self, what, priority):
+        interval = min(self._callbacks[what].values())
+        if what == 'sink_status':
+            # Sinks are each polled at their own rate, so whether any are due is checked every tick
+            self._sink_planner.set_base_interval(interval)
+            interval = TICK_INTERVAL
+        self._scheduler.schedule(what, interval, priority)
+
+    def _on_tick(self):
+        due = self._scheduler.tick()
+        if 'sink_status' in due and not self._sinks_due():
+            due.remove('sink_status')
+        if not due and not self._held_over:
+            return
+
+        # Only one run in flight: what falls due meanwhile waits for the next
+        if not self._run_lock.acquire(blocking=False):
+            self._dropped_ticks += 1
+            self._held_over.update(due)
+            return
+
+        if self._held_over:
+            due = self._scheduler.prioritise(self._held_over.union(due))
+            self._held_over.clear()
+
+        if due:
+            self._engine.run(due, self._run_finished)
+        else:
+            self._run_lock.release()
+
+    def _run_finished(self):
+        self._run_lock.release()
+        self._delivery.flush()
+
+    def next_sequence(self):
+        return next(self._sequence)
+
+    def _sinks_due(self):
+        streams = self._state.get('streams')
+        if not streams or self._plugin.transport.breaker.state != BreakerState.CLOSED:
+            # Once, so the state is updated with None
+            return not self._state.has('sink_status') or self._state.get('sink_status') is not None
+
+        self._plan_sinks(streams)
+        return self._sinks_changed or self._sink_planner.has_due()
+
+    def _plan_sinks(self, streams):
+        # Called from both the GUI thread (each tick) and the poll engine's (each run)
+        with self._lock:
+            if streams is self._planned_streams:
+                return
+
+            # (A dict, as it keeps the sinks' order)
+            sink_ids = dict.fromkeys(sink['id'] for sink in streams['sinks'])
+            removed = self._sink_planner.set_sinks(sink_ids)
+            self._sink_ids = sink_ids
+            for sink_id in removed:
+                self._sink_digests.pop(sink_id, None)
+                self._sink_statuses.pop(sink_id, None)
+            self._sinks_changed = True
+            self._planned_streams = streams
+
+    def burst_sink(self, sink_id):
+        '''Polls a sink's status more often for a while, e.g. after it has been edited.'''
+        self._sink_planner.burst(sink_id)
+
+    def sink_ids_to_poll(self):
+        '''The ids of the sinks whose status should be polled now, or None if they shouldn't be.'''
+        # Don't spend a half-open breaker's probe on one of many sinks
+        streams = self._state.get('streams')
+        if not streams or self._plugin.transport.breaker.state != BreakerState.CLOSED:
+            return None
+        # The sinks may have changed since the tick that started this run
+        self._plan_sinks(streams)
+        return self._sink_planner.due()
+
+    def _decode(self, body):
+        if body is None:
+            return None
+        return self._decode_json(body)
+
+    def deliver(self, what, sequence, body):
+        '''Called by the poll engine with the raw body received for an endpoint.'''
+        if what == 'sink_status' and body is not None:
+            self._deliver_sink_statuses(sequence, body)
+            return
+
+        digest = fingerprint(body)
+
+        with self._lock:
+            if sequence < self._delivered.get(what, -1):
+                # A more recent reply for this endpoint has already been delivered
+                return
+            self._delivered[what] = sequence
+            if body is not None:
+                self._delivery.mark_polled(what)
+
+            if what in self._fingerprints and digest == self._fingerprints[what]:
+                return
+            self._fingerprints[what] = digest
+
+        self._delivery.post(what, freeze(self._decode(body)))
+
+    def _deliver_sink_statuses(self, sequence, bodies):
+        '''
+        Merges the statuses polled for some of the sinks with those last polled for the rest.
+
+        Only the statuses that differ from the last polled are decoded.
+        '''
+        with self._lock:
+            if sequence < self._delivered.get('sink_status', -1):
+                return
+            self._delivered['sink_status'] = sequence
+            self._delivery.mark_polled('sink_status')
+
+            changed = self._sinks_changed
+            for sink_id, sink_body in bodies.items():
+                if sink_id not in self._sink_ids:
+                    # Removed whilst being polled
+                    continue
+                digest = fingerprint(sink_body)
+                sink_changed = sink_id not in self._sink_digests or digest != self._sink_digests[sink_id]
+                if sink_changed:
+                    self._sink_digests[sink_id] = digest
+                    self._sink_statuses[sink_id] = freeze(self._decode(sink_body))
+                    changed = True
+                self._sink_planner.record(sink_id, sink_changed, self._sink_statuses[sink_id])
+
+            # The last update may have been of None (whilst the daemon was unreachable)
+            if not changed and self._fingerprints.get('sink_status') is not None:
+                return
+            self._sinks_changed = False
+            self._sink_generation += 1
+            self._fingerprints['sink_status'] = self._sink_generation
+
+            statuses = MappingProxyType({
+                sink_id: self._sink_statuses[sink_id]
+                for sink_id in self._sink_ids if sink_id in self._sink_statuses
+            })
+
+        self._delivery.post('sink_status', statuses)
@@ -0,0 +1,111 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from enum import IntEnum
+from math import ceil, gcd
+
+
+class PollPriority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class _ScheduleEntry:
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('period', 'phase', 'priority')
+
+    def __init__(self, period, phase, priority):
+        self.period = period
+        self.phase = phase
+        self.priority = priority
+
+    def collides(self, period, phase):
+        '''Whether an entry with the given period and phase would ever share a tick with this.'''
+        return (phase - self.phase) % gcd(period, self.period) == 0
+
+    def is_due(self, tick):
+        return (tick - self.phase) % self.period == 0
+
+
+class PollScheduler:
+    '''
+    Decides which endpoints are due to be polled on each tick of a shared clock.
+
+    Each endpoint is polled once every `period` ticks. When an endpoint is
+    scheduled it is given a phase offset chosen to collide with as few of the
+    already-scheduled endpoints as possible, so that endpoints are spread out
+    across ticks instead of all being requested on the same one.
+    '''
+
+    def __init__(self, tick_interval):
+        self._tick_interval = tick_interval
+        self._tick = 0
+        self._entries = {}
+
+    @property
+    def tick_interval(self):
+        return self._tick_interval
+
+    def _choose_phase(self, what, period):
+        best_phase = None
+        best_load = None
+        # Candidates start from the next tick, so a new endpoint isn't left waiting a full period
+        for offset in range(period):
+            phase = (self._tick + 1 + offset) % period
+            load = sum(
+                1 for other, entry in self._entries.items()
+                if other != what and entry.collides(period, phase)
+            )
+            if best_load is None or load < best_load:
+                best_phase = phase
+                best_load = load
+            if not load:
+                break
+        return best_phase
+
+    def schedule(self, what, interval, priority):
+        period = max(1, ceil(interval / self._tick_interval))
+        entry = self._entries.get(what)
+        if entry and entry.period == period:
+            entry.priority = priority
+            return
+        self._entries[what] = _ScheduleEntry(period, self._choose_phase(what, period), priority)
+
+    def unschedule(self, what):
+        self._entries.pop(what, None)
+
+    def prioritise(self, endpoints):
+        '''Returns the given (scheduled) endpoints, most urgent first.'''
+        return sorted(
+            (what for what in endpoints if what in self._entries),
+            key=lambda what: self._entries[what].priority
+        )
+
+    def tick(self):
+        '''Advances the clock by one tick, returning the endpoints now due (most urgent first).'''
+        self._tick += 1
+        return self.prioritise(
+            what for what, entry in self._entries.items() if entry.is_due(self._tick)
+        )
@@ -0,0 +1,103 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from collections import namedtuple
+from functools import lru_cache
+import re
+
+
+# Enough for the SDP of every source on a large network, without growing unbounded
+SDP_CACHE_SIZE = 4096
+
+# Matches only those lines holding the fields (or attributes) that are parsed
+_FIELD_REGEX = re.compile(r'^(?:a=(rtpmap|ptime|ts-refclk|mediaclk):|([osc])=)(.*?)\r?$', re.MULTILINE)
+
+SdpOrigin = namedtuple(
+    'SdpOrigin',
+    ('username', 'session_id', 'session_version', 'network_type', 'address_type', 'address')
+)
+
+SdpConnection = namedtuple('SdpConnection', ('network_type', 'address_type', 'address', 'ttl'))
+
+SdpRtpMap = namedtuple('SdpRtpMap', ('payload_type', 'codec', 'rate', 'channels'))
+
+SdpSession = namedtuple(
+    'SdpSession',
+    ('session_name', 'origin', 'connection', 'rtpmap', 'ptime', 'ts_refclk', 'mediaclk')
+)
+
+def _parse_origin(value):
+    fields = value.split()
+    if len(fields) != 6:
+        return None
+    return SdpOrigin(*fields)
+
+def _parse_connection(value):
+    fields = value.split()
+    if len(fields) != 3:
+        return None
+
+    # IPv4 multicast addresses may be followed by a TTL (and a number of addresses); IPv6 ones only by a
+    # number of addresses
+    address, *suffix = fields[2].split('/')
+    ttl = int(suffix[0]) if fields[1] == 'IP4' and suffix and suffix[0].isdigit() else None
+    return SdpConnection(fields[0], fields[1], address, ttl)
+
+def _parse_rtpmap(value):
+    try:
+        payload_type, encoding = value.split(None, 1)
+        codec, rate, *channels = encoding.strip().split('/')
+        # The number of channels is optional, and defaults to one
+        return SdpRtpMap(int(payload_type), codec, int(rate), int(channels[0]) if channels else 1)
+    except ValueError:
+        return None
+
+def _parse_ptime(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=SDP_CACHE_SIZE)
+def parse_sdp(sdp):
+    '''
+    Parses the text of a Session Description into an SdpSession.
+
+    Only the first occurrence of each field is used; any field that is missing
+    (or malformed) is None. Results are memoised, so an unchanged SDP is only
+    ever parsed once.
+    '''
+    fields = {}
+    for attribute, kind, value in _FIELD_REGEX.findall(sdp):
+        fields.setdefault(attribute or kind, value.strip())
+
+    return SdpSession(
+        session_name=fields.get('s'),
+        origin=_parse_origin(fields['o']) if 'o' in fields else None,
+        connection=_parse_connection(fields['c']) if 'c' in fields else None,
+        rtpmap=_parse_rtpmap(fields['rtpmap']) if 'rtpmap' in fields else None,
+        ptime=_parse_ptime(fields['ptime']) if 'ptime' in fields else None,
+        ts_refclk=fields.get('ts-refclk'),
+        mediaclk=fields.get('mediaclk'),
+    )
@@ -0,0 +1,192 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+import time
+from threading import Lock
+
+from .util import SINK_FLAGS, StatusEnum
+
+
+# Per-sink polling intervals, in milliseconds
+BURST_INTERVAL = 250
+MAX_STABLE_INTERVAL = 16000
+
+# For how long (in milliseconds) a sink is polled at the burst rate, once it has
+# started reporting an error or warning, or has been created or edited
+BURST_DURATION = 5000
+
+# For how long (in milliseconds) a sink's status must stay the same before it is
+# polled less often (its interval doubling with each unchanged poll thereafter)
+STABLE_AFTER = 30000
+
+# Flags whose being raised puts a sink into a burst
+ALERT_FLAGS = tuple(
+    flag_name for flag_name, level in SINK_FLAGS.items()
+    if level['status'] in (StatusEnum.ERROR, StatusEnum.WARNING)
+)
+
+def has_alert(sink_status):
+    '''Whether a (decoded) sink status has any error or warning flag raised.'''
+    if not sink_status:
+        return False
+    sink_flags = sink_status['sink_flags']
+    return any(sink_flags.get(flag_name) for flag_name in ALERT_FLAGS)
+
+
+class TokenBucket:
+    '''
+    Limits how many requests are made per second, on average.
+
+    Up to `rate` tokens accumulate each second (holding at most one second's
+    worth); each request spends one.
+    '''
+
+    def __init__(self, rate, clock=time.monotonic):
+        self._rate = rate
+        self._tokens = rate
+        self._updated = clock()
+
+    def available(self, now):
+        self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        return int(self._tokens)
+
+    def spend(self, count):
+        self._tokens -= count
+
+
+class _SinkEntry:
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('interval', 'next_due', 'burst_until', 'stable_since', 'alerting')
+
+    def __init__(self, now, burst):
+        self.interval = None
+        self.next_due = now
+        self.burst_until = now + BURST_DURATION / 1000 if burst else 0
+        self.stable_since = now
+        self.alerting = False
+
+
+class SinkPollPlanner:
+    '''
+    Decides which sinks' statuses to poll, each at its own rate.
+
+    Sinks are polled every `base_interval` milliseconds, except that:
+      - a sink whose status hasn't changed for STABLE_AFTER is polled less and
+        less often, down to once every MAX_STABLE_INTERVAL;
+      - a sink that starts reporting an error or warning flag, or that has been
+        created (appearing after the first sinks were set) or edited, is polled
+        every BURST_INTERVAL for BURST_DURATION.
+
+    On top of which, no more than `budget` sinks are polled per second overall:
+    when more are due, those bursting go first, then those most overdue. The
+    rest wait for the next run.
+
+    Intervals are reckoned from when a sink's status was last recorded.
+    '''
+
+    def __init__(self, base_interval, budget, clock=time.monotonic):
+        self._base_interval = base_interval / 1000
+        self._clock = clock
+        self._bucket = TokenBucket(budget, clock)
+        self._lock = Lock()
+        self._entries = {}
+        self._sinks_set = False
+
+    def set_base_interval(self, base_interval):
+        with self._lock:
+            self._base_interval = base_interval / 1000
+
+    def set_sinks(self, sink_ids):
+        '''Sets which sinks there are, returning the ids of any that have gone.'''
+        now = self._clock()
+        with self._lock:
+            removed = self._entries.keys() - set(sink_ids)
+            for sink_id in removed:
+                del self._entries[sink_id]
+            for sink_id in sink_ids:
+                if sink_id not in self._entries:
+                    self._entries[sink_id] = _SinkEntry(now, burst=self._sinks_set)
+            self._sinks_set = True
+        return removed
+
+    def burst(self, sink_id):
+        '''Polls a sink at the burst rate for a while, from now.'''
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(sink_id)
+            if entry is None:
+                # A new sink is put into a burst when it appears
+                return
+            entry.burst_until = now + BURST_DURATION / 1000
+            entry.stable_since = now
+            entry.interval = BURST_INTERVAL / 1000
+            entry.next_due = min(entry.next_due, now)
+
+    def has_due(self):
+        '''Whether any sink is due to be polled (and the budget allows it).'''
+        now = self._clock()
+        with self._lock:
+            if not self._bucket.available(now):
+                return False
+            return any(entry.next_due <= now for entry in self._entries.values())
+
+    def due(self):
+        '''Returns the ids of the sinks to poll now, spending the budget on them.'''
+        now = self._clock()
+        with self._lock:
+            due = [(sink_id, entry) for sink_id, entry in self._entries.items() if entry.next_due <= now]
+            available = self._bucket.available(now)
+            if len(due) > available:
+                due.sort(key=lambda item: (item[1].burst_until <= now, item[1].next_due))
+                del due[available:]
+            self._bucket.spend(len(due))
+
+            # Not polled again before its status is recorded (or, if it never is, an interval from now)
+            for _, entry in due:
+                entry.next_due = now + (entry.interval or self._base_interval)
+            return [sink_id for sink_id, _ in due]
+
+    def record(self, sink_id, changed, sink_status):
+        '''Records the status polled for a sink, and whether it differed from the last.'''
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(sink_id)
+            if entry is None:
+                return
+
+            alerting = has_alert(sink_status)
+            if alerting and not entry.alerting:
+                entry.burst_until = now + BURST_DURATION / 1000
+            entry.alerting = alerting
+            if changed or alerting:
+                entry.stable_since = now
+
+            if now < entry.burst_until:
+                entry.interval = BURST_INTERVAL / 1000
+            elif now - entry.stable_since >= STABLE_AFTER / 1000 and entry.interval:
+                entry.interval = min(max(entry.interval * 2, self._base_interval), MAX_STABLE_INTERVAL / 1000)
+            else:
+                entry.interval = self._base_interval
+            entry.next_due = now + entry.interval
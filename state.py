@@ -0,0 +1,130 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from collections import namedtuple
+from types import MappingProxyType
+
+
+DaemonSnapshot = namedtuple(
+    'DaemonSnapshot',
+    ('version', 'config', 'ptp_status', 'remote_sources', 'sink_status', 'streams'),
+    defaults=(None, None, None, None, None)
+)
+
+def freeze(value):
+    '''Returns a read-only copy of decoded JSON: dicts become mappingproxies, and lists tuples.'''
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class DaemonState:
+    '''
+    The latest data received from the daemon, as an immutable snapshot.
+
+    Each update replaces the snapshot, incrementing its version. Reading from
+    here never touches the network: the poller is what keeps it up to date.
+
+    Callbacks subscribed to a key are called with that key's current value as
+    soon as they subscribe (if the key has been received yet), and then with
+    each new value. Callbacks subscribed with `subscribe_all` are called with
+    the snapshot and the keys that changed in it.
+
+    Updates and callbacks happen on the GUI thread.
+    '''
+
+    KEYS = DaemonSnapshot._fields[1:]
+
+    def __init__(self):
+        self._snapshot = DaemonSnapshot(0)
+        self._versions = {}
+        self._subscribers = {}
+        self._all_subscribers = []
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def get(self, key):
+        return getattr(self._snapshot, key)
+
+    def has(self, key):
+        '''Whether anything has yet been received for a key.'''
+        return key in self._versions
+
+    def changed_since(self, version):
+        '''Returns the keys whose value has changed since the given version.'''
+        return [key for key, changed_at in self._versions.items() if changed_at > version]
+
+    def subscribe(self, key, callback):
+        if key not in self.KEYS:
+            return
+
+        subscribers = self._subscribers.setdefault(key, [])
+        if callback in subscribers:
+            return
+        subscribers.append(callback)
+
+        if self.has(key):
+            callback(self.get(key))
+
+    def unsubscribe(self, key, callback):
+        subscribers = self._subscribers.get(key, [])
+        if callback in subscribers:
+            subscribers.remove(callback)
+
+    def subscribe_all(self, callback):
+        if callback in self._all_subscribers:
+            return
+        self._all_subscribers.append(callback)
+        if self._versions:
+            callback(self._snapshot, list(self._versions))
+
+    def unsubscribe_all(self, callback):
+        if callback in self._all_subscribers:
+            self._all_subscribers.remove(callback)
+
+    def update(self, changes):
+        '''Applies a dict of (frozen) new values, keyed by key, as one new version.'''
+        changes = {key: value for key, value in changes.items() if key in self.KEYS}
+        if not changes:
+            return
+
+        version = self._snapshot.version + 1
+        self._snapshot = self._snapshot._replace(version=version, **changes)
+        for key in changes:
+            self._versions[key] = version
+
+        for key, value in changes.items():
+            for callback in list(self._subscribers.get(key, ())):
+                callback(value)
+
+        for callback in list(self._all_subscribers):
+            callback(self._snapshot, list(changes))
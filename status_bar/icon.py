@@ -23,7 +23,9 @@
 # pylint: disable=missing-docstring
 
 # pylint: disable=no-name-in-module
-from PyQt5.QtWidgets import QLabel, QSizePolicy
+from PyQt5.QtCore import QEvent, QSize
+from PyQt5.QtGui import QCursor, QIcon, QPixmap
+from PyQt5.QtWidgets import QLabel, QSizePolicy, QToolTip
 
 from lisp.ui.icons import IconTheme
 
@@ -31,6 +33,17 @@ from ..util import StatusEnum
 
 
 class StatusIcon(QLabel):
+    '''
+    An LED-like icon showing a status, with a tooltip.
+
+    The tooltip of a status may be given as a function returning its text,
+    instead of the text itself. It is then only called when the tooltip is
+    about to be shown (or, whilst it's shown, when the status changes).
+
+    The icon of each status is rasterised once per icon theme and device pixel
+    ratio, and shared between all StatusIcons. Updates that don't change the
+    status don't touch the pixmap, so don't cause a repaint.
+    '''
 
     ICON_SIZE = 12
     ICON_MAP = {
@@ -40,18 +53,56 @@ class StatusIcon(QLabel):
         StatusEnum.ERROR: 'led-error',
     }
 
+    # (icon theme name, device pixel ratio) -> {status: pixmap}
+    _pixmaps = {}
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self._tooltip_header = None
+        self._tooltip = ""
+        self._status = None
+        self._avoided_repaints = 0
+
+    @property
+    def avoided_repaints(self):
+        '''How many updates left the icon as it was.'''
+        return self._avoided_repaints
 
     def set_tooltip_header(self, new_text):
         self._tooltip_header = new_text
 
+    def _status_pixmap(self, status):
+        ratio = self.devicePixelRatioF()
+        key = (QIcon.themeName(), ratio)
+        pixmaps = StatusIcon._pixmaps.get(key)
+        if pixmaps is None:
+            pixmaps = {}
+            for icon_status, icon_name in self.ICON_MAP.items():
+                pixmap = IconTheme.get(icon_name).pixmap(QSize(self.ICON_SIZE, self.ICON_SIZE) * ratio)
+                pixmap.setDevicePixelRatio(ratio)
+                pixmaps[icon_status] = pixmap
+            StatusIcon._pixmaps[key] = pixmaps
+        return pixmaps.get(status, QPixmap())
+
     def update(self, new_status):
-        self.setPixmap(
-            IconTheme.get(
-                self.ICON_MAP.get(new_status['status'])
-            ).pixmap(self.ICON_SIZE)
-        )
-        self.setToolTip(f"{self._tooltip_header} {new_status['tooltip']}")
+        status = new_status['status']
+        if status == self._status:
+            self._avoided_repaints += 1
+        else:
+            self._status = status
+            self.setPixmap(self._status_pixmap(status))
+        self._tooltip = new_status['tooltip']
+
+        if QToolTip.isVisible() and self.underMouse():
+            QToolTip.showText(QCursor.pos(), self.tooltip_text(), self)
+
+    def tooltip_text(self):
+        tooltip = self._tooltip() if callable(self._tooltip) else self._tooltip
+        return f"{self._tooltip_header} {tooltip}"
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            QToolTip.showText(event.globalPos(), self.tooltip_text(), self)
+            return True
+        return super().event(event)
@@ -24,63 +24,38 @@
 
 import logging
 
-import requests
-
 # pylint: disable=import-error
 from lisp.ui.mainwindow import MainStatusBar
 
-from ..util import StatusEnum, make_api_get_request
+from ..util import SINK_FLAGS, StatusEnum
+from .sink_flags import SinkFlagTracker
 from .widget import StatusBarWidget
 
 logger = logging.getLogger(__name__) # pylint: disable=invalid-name
 
-SINK_FLAGS = {
-    "rtp_seq_id_error": {
-        'status': StatusEnum.ERROR,
-        'tooltip': "Incorrect RTP sequence",
-    },
-    "rtp_ssrc_error": {
-        'status': StatusEnum.ERROR,
-        'tooltip': "Received data from unexpected source",
-    },
-    "rtp_payload_type_error": {
-        'status': StatusEnum.ERROR,
-        'tooltip': "Unexpected payload type",
-    },
-    "rtp_sac_error": {
-        'status': StatusEnum.ERROR,
-        'tooltip': "Packet with invalid timestamp",
-    },
-    "receiving_rtp_packet": {
-        'status': StatusEnum.NORMAL,
-        'tooltip': "Receiving Audio",
-    },
-    "some_muted": {
-        'status': StatusEnum.DEBUG,
-        'tooltip': "Unused flag",
-    },
-    "all_muted": {
-        'status': StatusEnum.DEBUG,
-        'tooltip': "Unused flag",
-    },
-    "muted": {
-        'status': StatusEnum.NORMAL,
-        'tooltip': "Audio stream muted",
-    },
-}
-
 
 class StatusBarIndicator:
+    '''Shows the state of the PTP clock and of the local sinks in LiSP's status bar.'''
 
     def __init__(self, plugin):
         self._plugin = plugin
         self._widget = None
+        self._sink_names = {}
+        self._sink_names_version = 0
+        self._sink_statuses = {}
+        self._sink_flags = SinkFlagTracker()
+        self._shown_version = None
+
+        self._sinks_tooltip = None
+        self._sinks_tooltip_version = None
 
     def show(self):
         if not self._widget:
             self._widget = StatusBarWidget()
         self._plugin.poller.add_callback('ptp_status', self.update_ptp)
-        self._plugin.poller.add_callback('streams', self.update_sinks)
+        self._plugin.poller.add_callback('streams', self.update_sink_names)
+        self._plugin.poller.add_callback('sink_status', self.update_sinks)
+        self._plugin.poller.add_poll_callback('sink_status', self.sinks_polled)
 
         # MainWindow > .statusBar > MainStatusBar
         status_bar = self._plugin.app.window.statusBar().findChild(MainStatusBar)
@@ -91,7 +66,9 @@ class StatusBarIndicator:
         if not self._widget:
             return
         self._plugin.poller.remove_callback('ptp_status', self.update_ptp)
-        self._plugin.poller.remove_callback('streams', self.update_sinks)
+        self._plugin.poller.remove_callback('streams', self.update_sink_names)
+        self._plugin.poller.remove_callback('sink_status', self.update_sinks)
+        self._plugin.poller.remove_poll_callback('sink_status', self.sinks_polled)
 
         status_bar = self._plugin.app.window.statusBar().findChild(MainStatusBar)
         status_layout = status_bar.layout()
@@ -99,7 +76,8 @@ class StatusBarIndicator:
 
     def update_ptp(self, json):
         if not json:
-            self._widget.clear()
+            # Only the PTP icon: the sinks' statuses are polled (and fail) separately
+            self._widget.clear_ptp()
             return
 
         self._widget.update_ptp_status({
@@ -117,52 +95,70 @@ class StatusBarIndicator:
             },
         }.get(json['status']))
 
-    def update_sinks(self, json):
+    def update_sink_names(self, json):
         if not json:
             return
+        self._sink_names = {sink['id']: sink['name'] for sink in json['sinks']}
+        self._sink_names_version += 1
 
-        overall_status = StatusEnum.NORMAL
-        overall_tooltip = ""
-
-        # @todo: reuse from poller (somehow)
-        session = requests.session()
-        address = self._plugin.address
-
-        for sink in json['sinks']:
-            sink_reply = make_api_get_request(session, address, 'sink_status', sink['id'])
-            sink_tooltip = f"\n#{sink['id']}: {sink['name']}"
-
-            for flag_name, flag_value in sink_reply.json()['sink_flags'].items():
-                level = SINK_FLAGS.get(flag_name, StatusEnum.UNKNOWN)
-
-                if level == StatusEnum.UNKNOWN:
-                    logger.debug(f"Unrecognised flag '{flag_name}' (on Sink #{sink['id']} '{sink['name']}')")
-                    continue
-
-                if not flag_value:
-                    continue
-
-                sink_tooltip += f"\n    • {level['tooltip']}"
-
-                if level['status'] == StatusEnum.NORMAL:
-                    continue
-
-                if level['status'] == StatusEnum.ERROR:
-                    # .warning instead of .error, as the latter causes a dialog box to appear
-                    logger.warning(f"{level['tooltip']} on Sink #{sink['id']} ('{sink['name']}') [{flag_name}]")
-                    overall_status = StatusEnum.ERROR
+    def update_sinks(self, sink_statuses):
+        if sink_statuses is None:
+            self._widget.clear_sinks()
+            self._shown_version = None
+            return
+        self._sink_statuses = sink_statuses
 
-                elif level['status'] == StatusEnum.WARNING:
-                    logger.warning(f"{level['tooltip']} on Sink #{sink['id']} ('{sink['name']}') [{flag_name}]")
-                    if overall_status != StatusEnum.ERROR:
-                        overall_status = StatusEnum.WARNING
+        for transition in self._sink_flags.update(sink_statuses):
+            self._log_transition(transition)
+        self._show_sinks()
 
-                elif level['status'] == StatusEnum.DEBUG:
-                    logger.debug(f"{level['tooltip']} on Sink #{sink['id']} ('{sink['name']}') [{flag_name}]")
+    def sinks_polled(self):
+        for transition in self._sink_flags.settle():
+            self._log_transition(transition)
+        self._show_sinks()
 
-            overall_tooltip += sink_tooltip
+    def _show_sinks(self):
+        if self._sink_flags.version == self._shown_version:
+            return
+        self._shown_version = self._sink_flags.version
 
         self._widget.update_sinks_status({
-            'status': overall_status,
-            'tooltip': overall_tooltip,
+            'status': self._sink_flags.severity(),
+            'tooltip': self.sinks_tooltip,
         })
+
+    def sinks_tooltip(self):
+        version = (self._sink_flags.version, self._sink_names_version)
+        if version == self._sinks_tooltip_version:
+            return self._sinks_tooltip
+
+        unavailable = set(self._sink_flags.unavailable_sinks())
+        lines = []
+        for sink_id in self._sink_statuses:
+            lines.append(f"#{sink_id}: {self._sink_names.get(sink_id, '')}")
+            if sink_id in unavailable:
+                lines.append("    • Status unavailable")
+                continue
+            for flag_name in self._sink_flags.raised_flags(sink_id):
+                lines.append(f"    • {SINK_FLAGS[flag_name]['tooltip']}")
+
+        self._sinks_tooltip = "".join(f"\n{line}" for line in lines)
+        self._sinks_tooltip_version = version
+        return self._sinks_tooltip
+
+    def _log_transition(self, transition):
+        level = SINK_FLAGS[transition.flag_name]
+        sink_id = transition.sink_id
+        change = "" if transition.raised else " cleared"
+        message = (
+            f"{level['tooltip']}{change} on Sink #{sink_id} ('{self._sink_names.get(sink_id, '')}') "
+            f"[{transition.flag_name}]"
+        )
+
+        if level['status'] not in (StatusEnum.ERROR, StatusEnum.WARNING):
+            logger.debug(message)
+        elif transition.raised:
+            # .warning instead of .error, as the latter causes a dialog box to appear
+            logger.warning(message)
+        else:
+            logger.info(message)
@@ -0,0 +1,269 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+import logging
+import time
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from itertools import compress
+
+from ..util import SINK_FLAGS, StatusEnum
+
+logger = logging.getLogger(__name__) # pylint: disable=invalid-name
+
+
+# One bit per flag, in the order of SINK_FLAGS
+FLAG_BITS = {flag_name: 1 << position for position, flag_name in enumerate(SINK_FLAGS)}
+FLAG_NAMES = tuple(SINK_FLAGS)
+
+def _severity_mask(status):
+    return sum(FLAG_BITS[flag_name] for flag_name, level in SINK_FLAGS.items() if level['status'] == status)
+
+ERROR_FLAGS = _severity_mask(StatusEnum.ERROR)
+WARNING_FLAGS = _severity_mask(StatusEnum.WARNING)
+
+# For how long (in seconds) a flag must have been reported raised (or lowered)
+# before it is taken to have changed. Raising is prompt, so errors are shown
+# straight away, whilst lowering is slow, so a flag that flaps keeps the icon
+# steady. Times are reckoned by the clock, not by updates: an unchanged status
+# isn't passed on by the poller, so `settle` re-checks waiting flags after
+# each poll.
+RAISE_AFTER = 0
+LOWER_AFTER = 4
+
+# How many combinations of raised flags to remember the names of
+FLAG_MASK_CACHE_SIZE = 256
+
+FlagTransition = namedtuple('FlagTransition', ('sink_id', 'flag_name', 'raised'))
+FlagCounts = namedtuple('FlagCounts', ('raised', 'lowered'))
+
+try:
+    _bit_count = int.bit_count
+except AttributeError: # Python < 3.10
+    def _bit_count(value):
+        return bin(value).count('1')
+
+def _bit_positions(value):
+    '''Yields the position of each set bit of an int, lowest first.'''
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
+
+@lru_cache(maxsize=FLAG_MASK_CACHE_SIZE)
+def flag_names(mask):
+    '''The names of the flags in a bitmask, in the order of SINK_FLAGS.'''
+    return tuple(FLAG_NAMES[position] for position in _bit_positions(mask))
+
+def _drop_bit(bits, row, last):
+    '''Removes bit `row` from a bitset, moving bit `last` (the highest) into its place.'''
+    moved = bits >> last & 1
+    bits &= ~(1 << row | 1 << last)
+    if row != last:
+        bits |= moved << row
+    return bits
+
+
+class SinkFlagTracker:
+    '''The debounced state of each flag of each sink, with how often each has been raised and lowered.'''
+
+    def __init__(self, raise_after=RAISE_AFTER, lower_after=LOWER_AFTER, clock=time.monotonic):
+        self._raise_after = raise_after
+        self._lower_after = lower_after
+        self._clock = clock
+        self._version = 0
+
+        # Each sink has a row, holding a bitmask of its raised flags; each flag a column, holding a bitset of the
+        # rows it's raised in. So questions about every sink at once are answered with a few operations on ints
+        self._rows = {}
+        self._sink_ids = []
+        self._masks = array('L')
+        self._columns = [0] * len(FLAG_BITS)
+        self._unavailable = 0
+
+        self._pending = {} # Sink id -> {flag position: when it was first reported otherwise than it is}
+        self._counts = {}
+        self._layouts = {} # The names of a sink's flags, in the order reported -> the bit of each
+        self._unrecognised = set()
+
+    @property
+    def version(self):
+        return self._version
+
+    def update(self, sink_statuses):
+        '''Applies a poll of every sink's status, returning a FlagTransition for each flag that changed.'''
+        now = self._clock()
+        transitions = []
+
+        for sink_id in self._rows.keys() - sink_statuses.keys():
+            self._remove(sink_id)
+
+        for sink_id, sink_status in sink_statuses.items():
+            row = self._rows.get(sink_id)
+            if row is None:
+                row = self._add(sink_id)
+
+            row_bit = 1 << row
+            if not sink_status:
+                if not self._unavailable & row_bit:
+                    self._unavailable |= row_bit
+                    self._version += 1
+                continue
+            if self._unavailable & row_bit:
+                self._unavailable ^= row_bit
+                self._version += 1
+
+            # Packed into a bitmask without looping in Python: the daemon reports
+            # every sink's flags in the same order, so the bit of each is looked up
+            # once per order seen, rather than once per flag
+            sink_flags = sink_status['sink_flags']
+            layout = self._layouts.get(tuple(sink_flags))
+            if layout is None:
+                layout = self._add_layout(sink_id, tuple(sink_flags))
+            reported = sum(compress(layout, sink_flags.values()))
+
+            differing = reported ^ self._masks[row]
+            if differing or sink_id in self._pending:
+                self._debounce(sink_id, row, differing, now, transitions)
+
+        if transitions:
+            self._version += 1
+        return transitions
+
+    def settle(self):
+        '''Re-checks the flags waiting to change, returning a FlagTransition for each that now has.'''
+        now = self._clock()
+        transitions = []
+
+        for sink_id, pending in list(self._pending.items()):
+            row = self._rows[sink_id]
+            if self._unavailable & 1 << row:
+                continue
+            self._debounce(sink_id, row, sum(1 << position for position in pending), now, transitions)
+
+        if transitions:
+            self._version += 1
+        return transitions
+
+    def _debounce(self, sink_id, row, differing, now, transitions):
+        previous_pending = self._pending.pop(sink_id, {})
+        pending = {}
+        raised = self._masks[row]
+
+        for position in _bit_positions(differing):
+            flag_bit = 1 << position
+            since = previous_pending.get(position, now)
+            if now - since < (self._lower_after if raised & flag_bit else self._raise_after):
+                pending[position] = since
+                continue
+
+            raised ^= flag_bit
+            self._columns[position] ^= 1 << row
+
+            counts = self._counts.get((sink_id, position), FlagCounts(0, 0))
+            if raised & flag_bit:
+                self._counts[(sink_id, position)] = counts._replace(raised=counts.raised + 1)
+            else:
+                self._counts[(sink_id, position)] = counts._replace(lowered=counts.lowered + 1)
+            transitions.append(FlagTransition(sink_id, FLAG_NAMES[position], bool(raised & flag_bit)))
+
+        self._masks[row] = raised
+        if pending:
+            self._pending[sink_id] = pending
+
+    def _add_layout(self, sink_id, flag_names_reported):
+        for flag_name in flag_names_reported:
+            if flag_name not in FLAG_BITS and flag_name not in self._unrecognised:
+                self._unrecognised.add(flag_name)
+                logger.debug(f"Unrecognised flag '{flag_name}' (on Sink #{sink_id})")
+
+        layout = tuple(FLAG_BITS.get(flag_name, 0) for flag_name in flag_names_reported)
+        self._layouts[flag_names_reported] = layout
+        return layout
+
+    def _add(self, sink_id):
+        row = len(self._sink_ids)
+        self._rows[sink_id] = row
+        self._sink_ids.append(sink_id)
+        self._masks.append(0)
+        self._version += 1
+        return row
+
+    def _remove(self, sink_id):
+        # The last row is moved into the removed one's place, keeping the rows contiguous
+        row = self._rows.pop(sink_id)
+        last = len(self._sink_ids) - 1
+        if row != last:
+            moved_id = self._sink_ids[last]
+            self._sink_ids[row] = moved_id
+            self._rows[moved_id] = row
+            self._masks[row] = self._masks[last]
+        self._sink_ids.pop()
+        self._masks.pop()
+
+        self._columns = [_drop_bit(column, row, last) for column in self._columns]
+        self._unavailable = _drop_bit(self._unavailable, row, last)
+
+        self._pending.pop(sink_id, None)
+        for position in range(len(FLAG_NAMES)):
+            self._counts.pop((sink_id, position), None)
+        self._version += 1
+
+    def _rows_with(self, mask):
+        '''A bitset of the rows of the sinks with any of the flags in `mask` raised.'''
+        rows = 0
+        for position in _bit_positions(mask):
+            rows |= self._columns[position]
+        return rows
+
+    def severity(self):
+        '''The overall status of the sinks: the most severe of their raised flags (or of any being unavailable).'''
+        if self._rows_with(ERROR_FLAGS):
+            return StatusEnum.ERROR
+        if self._unavailable or self._rows_with(WARNING_FLAGS):
+            return StatusEnum.WARNING
+        return StatusEnum.NORMAL
+
+    def flag_counts(self):
+        '''How many sinks have each flag raised.'''
+        return {flag_name: _bit_count(column) for flag_name, column in zip(FLAG_NAMES, self._columns)}
+
+    def affected_sinks(self, mask=ERROR_FLAGS):
+        '''The ids of the sinks with any of the flags in `mask` raised.'''
+        return [self._sink_ids[row] for row in _bit_positions(self._rows_with(mask))]
+
+    def unavailable_sinks(self):
+        return [self._sink_ids[row] for row in _bit_positions(self._unavailable)]
+
+    def raised_flags(self, sink_id):
+        '''The names of the flags of a sink currently taken as raised, in the order of SINK_FLAGS.'''
+        row = self._rows.get(sink_id)
+        if row is None:
+            return ()
+        return flag_names(self._masks[row])
+
+    def counts(self, sink_id, flag_name):
+        '''How many times a flag of a sink has been raised and lowered.'''
+        return self._counts.get((sink_id, FLAG_NAMES.index(flag_name)), FlagCounts(0, 0))
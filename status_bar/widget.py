@@ -28,6 +28,11 @@ from PyQt5.QtWidgets import QHBoxLayout, QLabel, QSizePolicy, QWidget
 from ..util import StatusEnum
 from .icon import StatusIcon
 
+UNKNOWN_STATUS = {
+    'status': StatusEnum.UNKNOWN,
+    'tooltip': "Unable to connect to AES67 Daemon",
+}
+
 class StatusBarWidget(QWidget):
 
     def __init__(self, parent=None):
@@ -54,6 +59,11 @@ class StatusBarWidget(QWidget):
 
         self.clear()
 
+    @property
+    def avoided_repaints(self):
+        '''How many updates left the icons as they were.'''
+        return self._ptp_icon.avoided_repaints + self._sinks_icon.avoided_repaints
+
     def update_ptp_status(self, ptp):
         self._ptp_icon.update(ptp)
 
@@ -61,10 +71,12 @@ class StatusBarWidget(QWidget):
         self._sinks_icon.update(sinks)
 
     def clear(self):
-        status = {
-            'status': StatusEnum.UNKNOWN,
-            'tooltip': "Unable to connect to AES67 Daemon",
-        }
-        self._ptp_icon.update(status)
-        self._sinks_icon.update(status)
+        self.clear_ptp()
+        self.clear_sinks()
+
+    def clear_ptp(self):
+        self._ptp_icon.update(UNKNOWN_STATUS)
+
+    def clear_sinks(self):
+        self._sinks_icon.update(UNKNOWN_STATUS)
 
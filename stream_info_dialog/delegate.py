@@ -25,71 +25,186 @@
 from math import trunc
 
 # pylint: disable=no-name-in-module
-from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtCore import QModelIndex, QPointF, QRect, Qt
+from PyQt5.QtGui import QPainter, QPixmap, QStaticText
 from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionFocusRect
 
 from .node import StreamDataRole, StreamDirection
+from .proxy import source_index
 
-class StreamInfoDelegate(QStyledItemDelegate):
-    '''Display a Source or Sink'''
+
+class _RenderedItem:
+    '''The laid-out text of one item, positioned relative to the top-left of its rect.'''
     # pylint: disable=too-few-public-methods
+    __slots__ = ('key', 'texts')
+
+    def __init__(self, key, texts):
+        self.key = key
+        self.texts = texts
+
+
+class StreamInfoDelegate(QStyledItemDelegate):
+    '''
+    Display a Source or Sink
+
+    The text of each item is laid out once and cached as QStaticText, keyed
+    by the item's size and font. An item's cache entry is dropped when the
+    model signals that its data has changed, or that it has been removed.
+
+    The frame drawn around every item is the same for all of them, so it is
+    drawn once into a pixmap, keyed by size, palette and pixel ratio.
+    '''
 
     margin = 3
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._model = None
+        self._render_cache = {}
+        self._frame_key = None
+        self._frame_pixmap = None
+
     def createEditor(self, parent, option, index):
         # pylint: disable=invalid-name, no-self-use, unused-argument
         '''Disable the Editor'''
         return None
 
-    def paint(self, painter, option, index):
-        w = option.rect.width()
-        h = option.rect.height()
+    def watch(self, model):
+        '''Keeps the render cache in step with the given model.'''
+        if self._model is not None:
+            self._model.dataChanged.disconnect(self._on_data_changed)
+            self._model.rowsAboutToBeRemoved.disconnect(self._on_rows_removed)
+            self._model.modelReset.disconnect(self._render_cache.clear)
 
-        if option.state & QStyle.State_Selected:
-            hi_rect = QRect(option.rect)
-            hi_rect.adjust(1, 1, -1, -1)
-            painter.save()
-            painter.setPen(option.palette.highlight().color())
-            painter.setBrush(option.palette.highlight())
-            painter.drawRect(hi_rect)
-            painter.restore()
+        self._model = model
+        self._render_cache.clear()
+        model.dataChanged.connect(self._on_data_changed)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_removed)
+        model.modelReset.connect(self._render_cache.clear)
 
-        focrec = QStyleOptionFocusRect()
-        focrec.palette = option.palette
-        focrec.rect = QRect(option.rect)
-        QApplication.style().drawPrimitive(QStyle.PE_FrameFocusRect, focrec, painter)
+    def _forget_rows(self, first, last):
+        for row in range(first, last + 1):
+            self._render_cache.pop(self._model.index(row, 0, QModelIndex()).internalPointer(), None)
 
-        painter.save()
-        if option.state & QStyle.State_Selected:
-            painter.setPen(option.palette.highlightedText().color())
+    def _on_data_changed(self, top_left, bottom_right, _roles):
+        self._forget_rows(top_left.row(), bottom_right.row())
+
+    def _on_rows_removed(self, _parent, first, last):
+        self._forget_rows(first, last)
 
-        name_rect = QRect(option.rect)
+    def _layout(self, option, node):
+        w = option.rect.width()
+        h = option.rect.height()
+        metrics = option.fontMetrics
+        texts = []
+
+        def place(text, rect, align_right=False):
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(font=option.font)
+            size = static_text.size()
+            x = rect.right() + 1 - size.width() if align_right else rect.left()
+            y = rect.top() + (rect.height() - size.height()) / 2
+            texts.append((QPointF(x, y), static_text))
+
+        name_rect = QRect(0, 0, w, h)
         name_rect.adjust(
             self.margin,
             self.margin,
             self.margin,
             trunc(-h / 2) - self.margin
         )
-        painter.drawText(name_rect, Qt.AlignVCenter, index.model().data(index, StreamDataRole.NAME))
+        name = metrics.elidedText(node.data(StreamDataRole.NAME) or '', Qt.ElideRight, name_rect.width())
+        place(name, name_rect)
 
-        ch_rect = QRect(option.rect)
+        ch_rect = QRect(0, 0, w, h)
         ch_rect.adjust(
             self.margin,
             trunc(h / 2) + self.margin,
             -self.margin,
             -self.margin
         )
-        painter.drawText(ch_rect, Qt.AlignVCenter, f"{index.internalPointer().data(StreamDataRole.CH_COUNT)} ch")
+        place(f"{node.data(StreamDataRole.CH_COUNT)} ch", ch_rect)
 
-        if index.internalPointer().data(StreamDataRole.DIRECTION) == StreamDirection.SOURCE:
-            info_rect = QRect(option.rect)
+        if node.data(StreamDataRole.DIRECTION) == StreamDirection.SOURCE:
+            info_rect = QRect(0, 0, w, h)
             info_rect.adjust(
                 trunc(w / 2) + self.margin,
                 trunc(h / 2) + self.margin,
                 -self.margin,
                 -self.margin
             )
-            loc_text = 'Local' if index.internalPointer().data(StreamDataRole.IS_LOCAL) else 'Remote'
-            painter.drawText(info_rect, Qt.AlignRight | Qt.AlignVCenter, loc_text)
+            place('Local' if node.data(StreamDataRole.IS_LOCAL) else 'Remote', info_rect, True)
+
+        return texts
+
+    def _rendered(self, option, node):
+        key = (option.rect.width(), option.rect.height(), option.font.key())
+        rendered = self._render_cache.get(node)
+        if rendered is None or rendered.key != key:
+            rendered = _RenderedItem(key, self._layout(option, node))
+            self._render_cache[node] = rendered
+        return rendered
+
+    def _frame(self, painter, option):
+        ratio = painter.device().devicePixelRatioF()
+        key = (option.rect.width(), option.rect.height(), option.palette.cacheKey(), ratio)
+        if key != self._frame_key:
+            pixmap = QPixmap(option.rect.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+
+            focrec = QStyleOptionFocusRect()
+            focrec.palette = option.palette
+            focrec.rect = QRect(0, 0, option.rect.width(), option.rect.height())
+            frame_painter = QPainter(pixmap)
+            QApplication.style().drawPrimitive(QStyle.PE_FrameFocusRect, focrec, frame_painter)
+            frame_painter.end()
+
+            self._frame_key = key
+            self._frame_pixmap = pixmap
+        return self._frame_pixmap
+
+    def paint(self, painter, option, index):
+        node = source_index(index).internalPointer()
+        if node is None:
+            # A row heading a group of streams
+            self._paint_group_header(painter, option, index.data(Qt.DisplayRole))
+            return
+
+        if option.state & QStyle.State_Selected:
+            hi_rect = QRect(option.rect)
+            hi_rect.adjust(1, 1, -1, -1)
+            painter.save()
+            painter.setPen(option.palette.highlight().color())
+            painter.setBrush(option.palette.highlight())
+            painter.drawRect(hi_rect)
+            painter.restore()
+
+        painter.drawPixmap(option.rect.topLeft(), self._frame(painter, option))
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+
+        origin = QPointF(option.rect.topLeft())
+        for position, static_text in self._rendered(option, node).texts:
+            painter.drawStaticText(origin + position, static_text)
+
+        painter.restore()
+
+    def _paint_group_header(self, painter, option, label):
+        h = option.rect.height()
+
+        painter.save()
+        font = option.font
+        font.setBold(True)
+        painter.setFont(font)
+
+        label_rect = QRect(option.rect)
+        label_rect.adjust(self.margin, trunc(h / 2), -self.margin, -self.margin)
+        painter.drawText(label_rect, Qt.AlignBottom, label)
 
+        painter.setPen(option.palette.mid().color())
+        painter.drawLine(label_rect.bottomLeft(), label_rect.bottomRight())
         painter.restore()
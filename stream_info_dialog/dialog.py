@@ -62,11 +62,13 @@ class StreamInfoDialog(QDialog):
         super().open(*args, **kwargs)
         self._plugin.poller.add_callback('streams', self.update_local_streams)
         self._plugin.poller.add_callback('remote_sources', self.update_remote_sources)
+        self._plugin.poller.add_callback('config', self.update_daemon_name)
 
     def reject(self, *args, **kwargs):
         super().reject(*args, **kwargs)
         self._plugin.poller.remove_callback('streams', self.update_local_streams)
         self._plugin.poller.remove_callback('remote_sources', self.update_remote_sources)
+        self._plugin.poller.remove_callback('config', self.update_daemon_name)
 
     def update_local_streams(self, stream_definitions):
         if not stream_definitions:
@@ -78,3 +80,7 @@ class StreamInfoDialog(QDialog):
         if not stream_definitions:
             return
         self._sources.update_remote_streams(stream_definitions['remote_sources'])
+
+    def update_daemon_name(self, _):
+        # The plugin's own callback (added first) has already taken the new name
+        self._sources.update_daemon_name()
@@ -0,0 +1,64 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from collections import namedtuple
+
+
+StreamDiff = namedtuple('StreamDiff', ('inserted', 'removed', 'changed'))
+
+def diff_streams(current, definitions):
+    '''
+    Compares the streams currently held with a fresh list of their definitions.
+
+    `current` maps the id of each stream currently held to its definition.
+
+    Returns a StreamDiff of: the definitions of streams not currently held (in
+    the order given); the ids of held streams that are no longer present; and
+    the definitions of held streams whose definition has changed.
+    '''
+    inserted = []
+    changed = []
+    seen_ids = set()
+
+    for definition in definitions:
+        stream_id = definition['id']
+        seen_ids.add(stream_id)
+
+        if stream_id not in current:
+            inserted.append(definition)
+        elif current[stream_id] != definition:
+            changed.append(definition)
+
+    removed = [stream_id for stream_id in current if stream_id not in seen_ids]
+    return StreamDiff(inserted, removed, changed)
+
+def contiguous_ranges(rows):
+    '''Collapses row numbers into a list of (first, last) ranges, in ascending order.'''
+    ranges = []
+    for row in sorted(rows):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [tuple(row_range) for row_range in ranges]
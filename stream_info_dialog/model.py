@@ -22,20 +22,42 @@
 
 # pylint: disable=missing-docstring
 
-import re
-
 # pylint: disable=no-name-in-module
 from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
 
+from ..sdp import parse_sdp
+from .diff import contiguous_ranges, diff_streams
 from .node import StreamDataRole, StreamDirection, StreamInfoNode
 
 
 class StreamInfoModelTemplate(QAbstractItemModel):
+    '''
+    A flat list of the audio streams in one direction.
+
+    Alongside the list of nodes, the model keeps a dict mapping stream id to
+    row, and each node caches its own row, so that finding a stream is O(1),
+    and refreshing the model with n streams is O(n).
+
+    Names are indexed too (local and remote streams separately, as a remote
+    device may reuse the name of a local stream), so that a stream can be
+    found from its name, or from the session name it is advertised under.
+
+    Refreshes are diffed against the streams already held, and only the rows
+    actually inserted, removed or changed are signalled to views: insertions
+    and removals as contiguous ranges, changes by the roles that changed.
+    '''
+
     def __init__(self, plugin, direction):
         super().__init__()
         self._plugin = plugin
         self._direction = direction
         self._children_ids = []
+        self._id_rows = {}
+        self._local_name_ids = {}
+        self._remote_name_ids = {}
+        # The SDPs local sources are advertised with, by session name, from the remote sources
+        self._local_sessions = {}
+        self._sessions_daemon_name = None
         self.children = []
 
     def __iter__(self):
@@ -45,105 +67,168 @@ class StreamInfoModelTemplate(QAbstractItemModel):
     def __len__(self):
         return len(self.children)
 
+    def _reindex(self, first_row=0):
+        for row in range(first_row, len(self.children)):
+            self._id_rows[self._children_ids[row]] = row
+            self.children[row].set_rownum(row)
+
+    def _name_ids(self, stream_id):
+        # IDs of local streams are integers, those of remote streams are not
+        return self._local_name_ids if isinstance(stream_id, int) else self._remote_name_ids
+
+    def _unindex_name(self, stream_id, name):
+        name_ids = self._name_ids(stream_id)
+        if name_ids.get(name) == stream_id:
+            del name_ids[name]
+
     def _add_node(self, stream_id, definition):
-        node = StreamInfoNode(self, self._direction)
-        self._amend_node(node, definition)
+        row = len(self.children)
+        node = StreamInfoNode(self, self._direction, row)
 
         self._children_ids.append(stream_id)
         self.children.append(node)
+        self._id_rows[stream_id] = row
 
+        self._amend_node(node, definition)
         return node
 
     def _amend_node(self, node, definition):
-        node.setData(definition, StreamDataRole.RAW)
-        node.setData(definition['name'], StreamDataRole.NAME)
+        '''Updates a node from a stream definition, returning the roles that changed.'''
+        values = {
+            StreamDataRole.RAW: definition,
+            StreamDataRole.NAME: definition['name'],
+        }
 
         if 'sdp' in definition:
             # Local sources don't have this key (initially),
             # but they do when seen through the "remote sources" api
-            node.setData(definition['sdp'], StreamDataRole.SDP)
+            values[StreamDataRole.SDP] = definition['sdp']
 
-        ch_count = 0
         if 'map' in definition:
             # Sinks, and Local Sources
-            ch_count = len(definition['map'])
+            values[StreamDataRole.CH_COUNT] = len(definition['map'])
         else:
             # Remote Sources
-            ch_count = int(re.search(r'a=rtpmap.*/(.*)\n', definition['sdp']).group(1))
-        node.setData(ch_count, StreamDataRole.CH_COUNT)
-
-    def _update_node(self, stream_id, definition):
-        if stream_id not in self._children_ids:
-            return
-        idx = self._children_ids.index(stream_id)
-        self._amend_node(self.children[idx], definition)
-
-    def _cull_old_streams(self, old_streams, cull_local):
-        for stream_id in old_streams:
-            if isinstance(stream_id, int) ^ cull_local:
-                # IDs of local streams have an integer ID
-                # If we're culling local streams, we don't wish to skip this id
-                # It we're culling remote streams, we do wish to skip this id
-                continue
-
-            idx = self._children_ids.index(stream_id)
-            self.beginRemoveRows(QModelIndex(), idx, idx)
-            del self._children_ids[idx]
-            del self.children[idx]
+            rtpmap = parse_sdp(definition['sdp']).rtpmap
+            values[StreamDataRole.CH_COUNT] = rtpmap.channels if rtpmap else None
+
+        old_name = node.data(StreamDataRole.NAME)
+
+        changed = []
+        for role, value in values.items():
+            if node.data(role) != value:
+                node.setData(value, role)
+                changed.append(role)
+
+        if StreamDataRole.NAME in changed:
+            self._unindex_name(definition['id'], old_name)
+            self._name_ids(definition['id'])[definition['name']] = definition['id']
+
+        return changed
+
+    def _emit_data_changed(self, changed_rows):
+        '''Emits dataChanged for each contiguous range of rows sharing the same changed roles.'''
+        rows_by_roles = {}
+        for row, roles in changed_rows.items():
+            rows_by_roles.setdefault(frozenset(roles), []).append(row)
+
+        for roles, rows in rows_by_roles.items():
+            role_values = [role.value for role in roles]
+            for first, last in contiguous_ranges(rows):
+                self.dataChanged.emit(
+                    self.createIndex(first, 0, self.children[first]),
+                    self.createIndex(last, 0, self.children[last]),
+                    role_values
+                )
+
+    def _apply_diff(self, diff, local):
+        # Removals, from the last range back, so earlier ranges keep their row numbers
+        removed_rows = [self._id_rows[stream_id] for stream_id in diff.removed]
+        for first, last in reversed(contiguous_ranges(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for row in range(first, last + 1):
+                stream_id = self._children_ids[row]
+                del self._id_rows[stream_id]
+                self._unindex_name(stream_id, self.children[row].data(StreamDataRole.NAME))
+            del self._children_ids[first:last + 1]
+            del self.children[first:last + 1]
             self.endRemoveRows()
 
+        if removed_rows:
+            self._reindex(min(removed_rows))
+
+        changed_rows = {}
+        for definition in diff.changed:
+            row = self._id_rows[definition['id']]
+            roles = self._amend_node(self.children[row], definition)
+            if roles:
+                changed_rows[row] = roles
+        self._emit_data_changed(changed_rows)
+
+        if diff.inserted:
+            first = self.__len__()
+            self.beginInsertRows(QModelIndex(), first, first + len(diff.inserted) - 1)
+            for definition in diff.inserted:
+                node = self._add_node(definition['id'], definition)
+                if not local:
+                    node.setData(False, StreamDataRole.IS_LOCAL)
+            self.endInsertRows()
+
+    def _held_streams(self, local):
+        # IDs of local streams are integers, those of remote streams are not
+        return {
+            stream_id: self.children[row].data(StreamDataRole.RAW)
+            for row, stream_id in enumerate(self._children_ids)
+            if isinstance(stream_id, int) == local
+        }
+
+    def _attach_local_sdps(self):
+        self._sessions_daemon_name = self._plugin.daemon_name
+        sdp_rows = {}
+        for session_name, sdp in self._local_sessions.items():
+            row = self.rowOfStream(self.localStreamIdBySessionName(session_name))
+            if row is not None:
+                source = self.children[row]
+                if source.data(StreamDataRole.SDP) != sdp:
+                    source.setData(sdp, StreamDataRole.SDP)
+                    sdp_rows[row] = [StreamDataRole.SDP]
+        self._emit_data_changed(sdp_rows)
+
     def updateLocalStreamsFromDaemon(self, streams):
         if not streams:
             return
 
-        old_streams = list(self._children_ids)
-
-        rownum = self.__len__()
-        self.beginInsertRows(QModelIndex(), rownum, rownum)
-        for definition in streams:
-            stream_id = definition['id']
-
-            if stream_id in self._children_ids:
-                self._update_node(stream_id, definition)
-                old_streams.remove(stream_id)
-            else:
-                self._add_node(stream_id, definition)
-        self.endInsertRows()
+        diff = diff_streams(self._held_streams(True), streams)
+        self._apply_diff(diff, True)
 
-        if old_streams:
-            self._cull_old_streams(old_streams, True)
+        # The remote sources (only delivered when they change) may have listed
+        # a source before it was added here, or under its new name
+        if self._local_sessions and (diff.inserted or diff.changed):
+            self._attach_local_sdps()
 
     def updateRemoteStreamsFromDaemon(self, streams):
         if self._direction != StreamDirection.SOURCE or not streams:
             return
 
-        daemon_name = self._plugin.daemon_name
-        old_streams = list(self._children_ids)
+        remote_streams = []
+        self._local_sessions = {}
 
-        rownum = self.__len__()
-        self.beginInsertRows(QModelIndex(), rownum, rownum)
         for definition in streams:
 
             # If this source is, in fact, a local one
             if definition['address'] == self._plugin.ip:
-                for source in self.children:
-                    candidate_name = f"{daemon_name} {source.data(StreamDataRole.NAME)}"
-                    if candidate_name == definition['name']:
-                        source.setData(definition['sdp'], StreamDataRole.SDP)
-                        break
+                self._local_sessions[definition['name']] = definition['sdp']
                 continue
 
-            source_id = definition['id']
-            if source_id in self._children_ids:
-                self._update_node(source_id, definition)
-            else:
-                node = self._add_node(source_id, definition)
-                node.setData(False, StreamDataRole.IS_LOCAL)
+            remote_streams.append(definition)
 
-        self.endInsertRows()
+        self._attach_local_sdps()
+        self._apply_diff(diff_streams(self._held_streams(False), remote_streams), False)
 
-        if old_streams:
-            self._cull_old_streams(old_streams, False)
+    def updateDaemonName(self):
+        '''Re-attaches local sources' SDPs, their session names being prefixed with the daemon's name.'''
+        if self._local_sessions and self._plugin.daemon_name != self._sessions_daemon_name:
+            self._attach_local_sdps()
 
     def localStreamIds(self):
         if self._direction == StreamDirection.SINK:
@@ -155,10 +240,33 @@ class StreamInfoModelTemplate(QAbstractItemModel):
                 ids.append(stream_id)
         return ids
 
+    def localStreamIdByName(self, name):
+        return self._local_name_ids.get(name)
+
+    def localStreamIdBySessionName(self, session_name):
+        '''Finds the local stream advertised under a session name: "<daemon name> <stream name>".'''
+        prefix = f"{self._plugin.daemon_name} "
+        if not session_name or not session_name.startswith(prefix):
+            return None
+        return self._local_name_ids.get(session_name[len(prefix):])
+
+    def remoteStreamIdByName(self, name):
+        return self._remote_name_ids.get(name)
+
+    def streamIdBySessionName(self, session_name):
+        '''Finds the stream - local or remote - advertised under a session name.'''
+        stream_id = self.localStreamIdBySessionName(session_name)
+        if stream_id is None:
+            stream_id = self._remote_name_ids.get(session_name)
+        return stream_id
+
+    def rowOfStream(self, stream_id):
+        return self._id_rows.get(stream_id)
+
     def streamId(self, index):
         if not index.isValid():
             return None
-        return self._children_ids[self.children.index(index.internalPointer())]
+        return self._children_ids[index.internalPointer().rownum()]
 
     def streamIds(self):
         return self._children_ids
@@ -189,14 +297,10 @@ class StreamInfoModelTemplate(QAbstractItemModel):
         return index.internalPointer().flags
 
     def index(self, row_num, col_num, parent_idx):
-        if not self.hasIndex(row_num, col_num, parent_idx):
+        # Cheaper than hasIndex(), which calls back into rowCount() and columnCount()
+        if parent_idx.isValid() or col_num != 0 or not 0 <= row_num < len(self.children):
             return QModelIndex()
-
-        child_node = self.children[row_num]
-
-        if child_node:
-            return self.createIndex(row_num, col_num, child_node)
-        return QModelIndex()
+        return self.createIndex(row_num, col_num, self.children[row_num])
 
     def parent(self, index):
         # pylint: disable=no-self-use, unused-argument
@@ -23,6 +23,7 @@
 # pylint: disable=missing-docstring
 
 import enum
+from operator import attrgetter
 
 # pylint: disable=no-name-in-module
 from PyQt5.QtCore import Qt, QModelIndex, QSize
@@ -41,13 +42,53 @@ class StreamDataRole(enum.Enum):
     IS_LOCAL = _userdatarole + 4
     DIRECTION = _userdatarole + 5
 
-class StreamInfoNode:
-    _size = QSize(128, 48)
+_SIZE_HINT = QSize(128, 48)
+
+# Role -> the slot holding its value, for those roles that may be set
+_SETTABLE_ROLES = {
+    StreamDataRole.RAW: '_stream_raw_definition',
+    StreamDataRole.SDP: '_sdp',
+    StreamDataRole.NAME: '_stream_name',
+    StreamDataRole.CH_COUNT: '_ch_count',
+    StreamDataRole.IS_LOCAL: '_is_local',
+}
+
+# Role -> a function returning that role's value from a node
+_DATA_ROLES = {
+    Qt.DisplayRole: attrgetter('_row'),
+    Qt.SizeHintRole: lambda node: _SIZE_HINT,
+    StreamDataRole.DIRECTION: attrgetter('_direction'),
+}
+_DATA_ROLES.update({role: attrgetter(slot) for role, slot in _SETTABLE_ROLES.items()})
 
-    def __init__(self, model, direction):
+# Views (and proxy models) ask for custom roles by their integer value
+_DATA_ROLES.update({role.value: _DATA_ROLES[role] for role in StreamDataRole})
+
+
+class StreamInfoNode:
+    '''
+    A single stream, as held by a StreamInfoModel.
+
+    The node's row number is cached here, and kept up to date by its model.
+    '''
+
+    __slots__ = (
+        '_direction',
+        '_model',
+        '_row',
+        '_stream_raw_definition',
+        '_stream_name',
+        '_ch_count',
+        '_is_local',
+        '_sdp',
+    )
+
+    flags = Qt.ItemFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemNeverHasChildren)
+
+    def __init__(self, model, direction, row=-1):
         self._direction = direction
         self._model = model
-        self.flags = Qt.ItemFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemNeverHasChildren)
+        self._row = row
 
         self._stream_raw_definition = None
         self._stream_name = None
@@ -56,58 +97,38 @@ class StreamInfoNode:
         self._sdp = None
 
     def data(self, role=Qt.DisplayRole):
-        return {
-            Qt.DisplayRole: self.rownum(),
-            Qt.SizeHintRole: lambda: self._size,
-            StreamDataRole.RAW: lambda: self._stream_raw_definition,
-            StreamDataRole.SDP: lambda: self._sdp,
-            StreamDataRole.NAME: lambda: self._stream_name,
-            StreamDataRole.CH_COUNT: lambda: self._ch_count,
-            StreamDataRole.IS_LOCAL: lambda: self._is_local,
-            StreamDataRole.DIRECTION: lambda: self._direction,
-        }.get(role, lambda: None)()
+        getter = _DATA_ROLES.get(role)
+        return getter(self) if getter else None
 
     def index(self):
-        return self.model().createIndex(self.rownum(), 0, self)
+        return self.model().createIndex(self._row, 0, self)
 
     def model(self):
         return self._model
 
     def next_sibling(self):
-        if self.rownum() < len(self.parent) - 1:
-            return self._model.children[self.rownum() + 1]
+        if self._row < len(self._model) - 1:
+            return self._model.children[self._row + 1]
         return None
 
     def parent(self):
         return QModelIndex()
 
     def prev_sibling(self):
-        if self.rownum():
-            return self._model.children[self.rownum() - 1]
+        if self._row:
+            return self._model.children[self._row - 1]
         return None
 
     def rownum(self):
-        return self._model.children.index(self)
+        return self._row
 
-    def setData(self, value, role):
-        if role == StreamDataRole.RAW:
-            self._stream_raw_definition = value
-            return True
-
-        if role == StreamDataRole.SDP:
-            self._sdp = value
-            return True
-
-        if role == StreamDataRole.NAME:
-            self._stream_name = value
-            return True
+    def set_rownum(self, row):
+        '''Called by the model whenever the node moves to a different row.'''
+        self._row = row
 
-        if role == StreamDataRole.CH_COUNT:
-            self._ch_count = value
-            return True
-
-        if role == StreamDataRole.IS_LOCAL:
-            self._is_local = value
-            return True
-
-        return False
+    def setData(self, value, role):
+        slot = _SETTABLE_ROLES.get(role)
+        if slot is None:
+            return False
+        setattr(self, slot, value)
+        return True
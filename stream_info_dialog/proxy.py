@@ -0,0 +1,594 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from bisect import bisect_left
+import enum
+import ipaddress
+
+# pylint: disable=no-name-in-module
+from PyQt5.QtCore import Qt, QAbstractProxyModel, QModelIndex, QSortFilterProxyModel
+
+from ..sdp import parse_sdp
+from .node import StreamDataRole
+
+
+GRAM_LENGTH = 3
+
+# Roles whose change alters the text a stream is indexed by
+_INDEXED_ROLES = (StreamDataRole.NAME.value, StreamDataRole.SDP.value)
+
+# Roles whose change may move a stream to a different place (or group)
+_SORTED_ROLES = (
+    StreamDataRole.RAW.value,
+    StreamDataRole.NAME.value,
+    StreamDataRole.SDP.value,
+    StreamDataRole.IS_LOCAL.value,
+)
+
+# Above this many rows, inserting (or removing) rows one at a time costs more than re-sorting them all
+BULK_ROW_COUNT = 256
+
+class GroupBy(enum.Enum):
+    NOTHING = enum.auto()
+    DEVICE = enum.auto()
+    SUBNET = enum.auto()
+    FORMAT = enum.auto()
+    LOCATION = enum.auto()
+
+def source_index(index):
+    '''Maps an index through any number of proxy models, back to that of the underlying model.'''
+    model = index.model()
+    while isinstance(model, QAbstractProxyModel):
+        index = model.mapToSource(index)
+        model = index.model()
+    return index
+
+def searchable_text(node):
+    '''The (lowercased) text a stream may be found by: its name, origin host, multicast address and codec.'''
+    fields = [node.data(StreamDataRole.NAME) or '']
+
+    sdp = node.data(StreamDataRole.SDP)
+    if sdp:
+        session = parse_sdp(sdp)
+        if session.origin:
+            fields.append(session.origin.address)
+        if session.connection:
+            fields.append(session.connection.address)
+        if session.rtpmap:
+            fields.append(session.rtpmap.codec)
+
+    return '\n'.join(fields).lower()
+
+def grams(text):
+    return {text[pos:pos + GRAM_LENGTH] for pos in range(len(text) - GRAM_LENGTH + 1)}
+
+
+class NGramIndex:
+    '''
+    An index of the text of each stream, by the n-grams (trigrams) found in it.
+
+    Finding the streams containing a term of at least three characters only
+    needs to check those streams holding every one of the term's trigrams.
+    '''
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, node):
+        self.remove(node)
+        text = searchable_text(node)
+        self._texts[node] = text
+        for gram in grams(text):
+            self._postings.setdefault(gram, set()).add(node)
+
+    def remove(self, node):
+        text = self._texts.pop(node, None)
+        if text is None:
+            return
+        for gram in grams(text):
+            postings = self._postings[gram]
+            postings.discard(node)
+            if not postings:
+                del self._postings[gram]
+
+    def clear(self):
+        self._texts.clear()
+        self._postings.clear()
+
+    def matches(self, node, terms):
+        '''Whether a node's text contains every one of the given (lowercased) terms.'''
+        text = self._texts.get(node, '')
+        return all(term in text for term in terms)
+
+    def search(self, terms):
+        '''Returns the set of nodes whose text contains every one of the given (lowercased) terms.'''
+        candidates = None
+        for term in terms:
+            term_grams = grams(term)
+            if not term_grams:
+                # Too short to have been indexed; checked against each candidate's text below
+                continue
+            postings = sorted((self._postings.get(gram, set()) for gram in term_grams), key=len)
+            found = postings[0].intersection(*postings[1:])
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return set()
+
+        if candidates is None:
+            candidates = self._texts
+        return {node for node in candidates if self.matches(node, terms)}
+
+
+class StreamFilterProxyModel(QSortFilterProxyModel):
+    '''
+    Filters a StreamInfoModelTemplate (or a StreamSortProxyModel of one) down
+    to the streams matching some text.
+
+    The text is split into terms (on whitespace), and a stream is shown if
+    each term is found in its name, origin host, multicast address or codec.
+    A group header is shown if any stream of its group is.
+
+    Streams are indexed as the model inserts, changes and removes them, so
+    changing the filter text only needs a lookup of the index.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = NGramIndex()
+        self._terms = []
+        self._matched = set()
+        self._entry = None
+        self._groups = None
+        self._shown = None
+
+    def setSourceModel(self, model):
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.rowsInserted.disconnect(self._on_rows_inserted)
+            previous.rowsAboutToBeRemoved.disconnect(self._on_rows_removed)
+            previous.dataChanged.disconnect(self._on_data_changed)
+            previous.modelReset.disconnect(self._reindex)
+
+        # Connected before the proxy's own handlers, so the index is up to date before rows are filtered
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self._reindex)
+
+        if isinstance(model, StreamSortProxyModel):
+            self._entry = model.entry
+            self._groups = model
+        else:
+            self._entry = lambda row: model.children[row]
+            self._groups = None
+
+        super().setSourceModel(model)
+        self._reindex()
+
+    def _update_shown(self):
+        # The headers to show are worked out for every group at once, rather than by looking through each group
+        # for a match as its header is filtered
+        if self._groups is not None:
+            self._shown = self._matched | self._groups.groupHeaders(self._matched)
+        else:
+            self._shown = self._matched
+
+    def _add_rows(self, first, last):
+        # Any header may now need showing or hiding: each is looked at as it's signalled as changed
+        self._shown = None
+        for row in range(first, last + 1):
+            node = self._entry(row)
+            if isinstance(node, GroupHeader):
+                continue
+            self._index.add(node)
+            if self._terms and self._index.matches(node, self._terms):
+                self._matched.add(node)
+            else:
+                self._matched.discard(node)
+
+    def _reindex(self):
+        self._index.clear()
+        self._matched.clear()
+        self._add_rows(0, self.sourceModel().rowCount(QModelIndex()) - 1)
+        self._update_shown()
+
+    def _on_rows_inserted(self, _parent, first, last):
+        self._add_rows(first, last)
+
+    def _on_rows_removed(self, _parent, first, last):
+        self._shown = None
+        for row in range(first, last + 1):
+            node = self._entry(row)
+            self._index.remove(node)
+            self._matched.discard(node)
+
+    def _on_data_changed(self, top_left, bottom_right, roles):
+        if roles and not any(role in _INDEXED_ROLES for role in roles):
+            return
+        self._add_rows(top_left.row(), bottom_right.row())
+
+    def filterText(self):
+        return ' '.join(self._terms)
+
+    def setFilterText(self, text):
+        terms = text.lower().split()
+        if terms == self._terms:
+            return
+        self._terms = terms
+        self._matched = self._index.search(terms) if terms else set()
+        self._update_shown()
+        # Signals one change of layout, rather than the insertion and removal of each range of rows
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, _source_parent):
+        # pylint: disable=invalid-name
+        if not self._terms:
+            return True
+        entry = self._entry(source_row)
+        if self._shown is not None:
+            return entry in self._shown
+        if isinstance(entry, GroupHeader):
+            return not self._matched.isdisjoint(self._groups.groupMembers(source_row))
+        return entry in self._matched
+
+
+def _device_group(session):
+    if session and session.origin:
+        address = session.origin.address
+        try:
+            # So that devices are in numerical order of address, where possible
+            parsed = ipaddress.ip_address(address)
+            return (0, parsed.version, int(parsed), address), address
+        except ValueError:
+            return (0, 7, 0, address), address
+    return (1,), "Unknown device"
+
+def _subnet_group(session):
+    if session and session.connection:
+        try:
+            address = ipaddress.ip_address(session.connection.address)
+        except ValueError:
+            pass
+        else:
+            network = ipaddress.ip_network(f"{address}/{24 if address.version == 4 else 64}", strict=False)
+            return (0, address.version, int(network.network_address)), str(network)
+    return (1,), "Unknown subnet"
+
+def _format_group(session):
+    if session and session.rtpmap:
+        rtpmap = session.rtpmap
+        return (0, rtpmap.codec, rtpmap.rate), f"{rtpmap.codec} {rtpmap.rate / 1000:g} kHz"
+    return (1,), "Unknown format"
+
+def group_of(node, group_by):
+    '''Returns the key (which groups sort by) and the label of the group a stream belongs to.'''
+    if group_by == GroupBy.NOTHING:
+        return None, None
+
+    if group_by == GroupBy.LOCATION:
+        if node.data(StreamDataRole.IS_LOCAL):
+            return (0,), "Local"
+        return (1,), "Remote"
+
+    sdp = node.data(StreamDataRole.SDP)
+    session = parse_sdp(sdp) if sdp else None
+    return {
+        GroupBy.DEVICE: _device_group,
+        GroupBy.SUBNET: _subnet_group,
+        GroupBy.FORMAT: _format_group,
+    }[group_by](session)
+
+
+class GroupHeader:
+    '''A row of a StreamSortProxyModel that heads a group of streams, rather than being one.'''
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('label',)
+
+    flags = Qt.ItemFlags(Qt.ItemIsEnabled | Qt.ItemNeverHasChildren)
+
+    def __init__(self, label):
+        self.label = label
+
+
+class StreamSortProxyModel(QAbstractProxyModel):
+    '''
+    Sorts streams by name, optionally grouped (each group headed by a row of its own).
+
+    Rows are kept in a list sorted by key: each stream's key being its group,
+    name and id; each group header's key sorting it before the streams of its
+    group. As streams arrive, leave or change, they are put in (or taken out
+    of) place by binary search, instead of re-sorting every row. Only when
+    very many rows change at once - or the grouping changes - is everything
+    re-sorted.
+
+    When a group's streams change, its header is signalled as changed too, so
+    that a StreamFilterProxyModel above can show or hide it.
+
+    The source model may be a StreamInfoModelTemplate, or a proxy of one.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._group_by = GroupBy.NOTHING
+        self._keys = []
+        self._entries = []
+        self._node_keys = {}
+        self._key_cache = {}
+        self._group_labels = {}
+        self._group_sizes = {}
+        self._group_headers = {}
+        self._resetting = False
+
+    def setSourceModel(self, model):
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.rowsInserted.disconnect(self._on_rows_inserted)
+            previous.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+            previous.rowsRemoved.disconnect(self._on_rows_removed)
+            previous.dataChanged.disconnect(self._on_data_changed)
+            previous.modelReset.disconnect(self._on_model_reset)
+            previous.layoutChanged.disconnect(self._resort)
+
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self._on_model_reset)
+        model.layoutChanged.connect(self._resort)
+        self._node_keys.clear()
+        self._key_cache.clear()
+        self._rebuild()
+        self.endResetModel()
+
+    def groupBy(self):
+        return self._group_by
+
+    def setGroupBy(self, group_by):
+        if group_by == self._group_by:
+            return
+        self._group_by = group_by
+        self._resort()
+
+    def _node(self, source_row):
+        return source_index(self.sourceModel().index(source_row, 0, QModelIndex())).internalPointer()
+
+    def _base_model(self):
+        model = self.sourceModel()
+        return model.sourceModel() if isinstance(model, QAbstractProxyModel) else model
+
+    def _key_of(self, node):
+        '''
+        Returns the key of a stream, noting the label of its group.
+
+        Keys are memoised against the (immutable) definition and SDP they were
+        made from - so are still valid for streams that have spent some time
+        filtered out of this model, where their changes would not be seen.
+        '''
+        raw = node.data(StreamDataRole.RAW)
+        sdp = node.data(StreamDataRole.SDP)
+        is_local = node.data(StreamDataRole.IS_LOCAL)
+
+        cached = self._key_cache.get(node)
+        if cached and cached[0] is raw and cached[1] is sdp and cached[2:4] == (is_local, self._group_by):
+            return cached[4]
+
+        group_key, label = group_of(node, self._group_by)
+        self._group_labels[group_key] = label
+        name = node.data(StreamDataRole.NAME) or ''
+        key = (group_key, 1, name.casefold(), str(raw['id']))
+        self._key_cache[node] = (raw, sdp, is_local, self._group_by, key)
+        return key
+
+    def _prune_key_cache(self):
+        # Streams removed from the underlying model, whilst filtered out of this one, are never seen to go
+        children = self._base_model().children
+        if len(self._key_cache) > 2 * len(children):
+            self._key_cache = {node: self._key_cache[node] for node in children if node in self._key_cache}
+
+    def _rebuild(self):
+        self._prune_key_cache()
+        self._node_keys.clear()
+        self._group_sizes.clear()
+        self._group_headers.clear()
+        entries = {}
+        for row in range(self.sourceModel().rowCount(QModelIndex())):
+            node = self._node(row)
+            key = self._key_of(node)
+            self._node_keys[node] = key
+            entries[key] = node
+            if self._group_by != GroupBy.NOTHING:
+                group_key = (key[0], 0)
+                if group_key not in self._group_sizes:
+                    entries[group_key] = self._group_headers[group_key] = GroupHeader(self._group_labels[key[0]])
+                self._group_sizes[group_key] = self._group_sizes.get(group_key, 0) + 1
+
+        self._keys = sorted(entries)
+        self._entries = [entries[key] for key in self._keys]
+
+    def _resort(self):
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_model_reset(self):
+        self._node_keys.clear()
+        self._key_cache.clear()
+        self._resort()
+
+    def _insert_entry(self, key, entry):
+        row = bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.insert(row, key)
+        self._entries.insert(row, entry)
+        self.endInsertRows()
+
+    def _remove_entry(self, key):
+        row = bisect_left(self._keys, key)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._keys[row]
+        del self._entries[row]
+        self.endRemoveRows()
+
+    def _group_changed(self, key):
+        index = self.index(bisect_left(self._keys, (key[0], 0)), 0, QModelIndex())
+        self.dataChanged.emit(index, index, [])
+
+    def _insert_node(self, node):
+        key = self._key_of(node)
+        if self._group_by != GroupBy.NOTHING:
+            group_key = (key[0], 0)
+            if group_key not in self._group_sizes:
+                self._group_sizes[group_key] = 0
+                self._group_headers[group_key] = GroupHeader(self._group_labels[key[0]])
+                self._insert_entry(group_key, self._group_headers[group_key])
+            self._group_sizes[group_key] += 1
+        self._node_keys[node] = key
+        self._insert_entry(key, node)
+        if self._group_by != GroupBy.NOTHING:
+            # Even a new group's header: which was filtered before it had any streams
+            self._group_changed(key)
+
+    def _remove_node(self, node):
+        # Still mapped whilst its row is being removed
+        key = self._node_keys[node]
+        self._remove_entry(key)
+        del self._node_keys[node]
+        if self._group_by != GroupBy.NOTHING:
+            group_key = (key[0], 0)
+            self._group_sizes[group_key] -= 1
+            if not self._group_sizes[group_key]:
+                del self._group_sizes[group_key]
+                del self._group_headers[group_key]
+                self._remove_entry(group_key)
+            else:
+                self._group_changed(key)
+
+    def _on_rows_inserted(self, _parent, first, last):
+        if last - first >= BULK_ROW_COUNT:
+            self._resort()
+            return
+        for row in range(first, last + 1):
+            self._insert_node(self._node(row))
+
+    def _on_rows_about_to_be_removed(self, _parent, first, last):
+        if last - first >= BULK_ROW_COUNT:
+            # Finished once the rows are gone, in _on_rows_removed
+            self._resetting = True
+            self.beginResetModel()
+            return
+        for row in range(first, last + 1):
+            self._remove_node(self._node(row))
+
+    def _on_rows_removed(self, _parent, _first, _last):
+        if self._resetting:
+            self._resetting = False
+            self._rebuild()
+            self.endResetModel()
+
+    def _on_data_changed(self, top_left, bottom_right, roles):
+        resort = not roles or any(role in _SORTED_ROLES for role in roles)
+        for source_row in range(top_left.row(), bottom_right.row() + 1):
+            node = self._node(source_row)
+            if resort and self._key_of(node) != self._node_keys[node]:
+                self._remove_node(node)
+                self._insert_node(node)
+                continue
+            index = self.mapFromSource(top_left.siblingAtRow(source_row))
+            self.dataChanged.emit(index, index, roles)
+            if self._group_by != GroupBy.NOTHING:
+                self._group_changed(self._node_keys[node])
+
+    def mapFromSource(self, source_idx):
+        # pylint: disable=invalid-name
+        if not source_idx.isValid():
+            return QModelIndex()
+        node = source_index(source_idx).internalPointer()
+        row = bisect_left(self._keys, self._node_keys[node])
+        return self.createIndex(row, 0, node)
+
+    def mapToSource(self, proxy_idx):
+        # pylint: disable=invalid-name
+        if not proxy_idx.isValid():
+            return QModelIndex()
+        entry = self._entries[proxy_idx.row()]
+        if isinstance(entry, GroupHeader):
+            return QModelIndex()
+
+        model = self.sourceModel()
+        if isinstance(model, QAbstractProxyModel):
+            # e.g. a StreamFilterProxyModel
+            return model.mapFromSource(model.sourceModel().index(entry.rownum(), 0, QModelIndex()))
+        return model.index(entry.rownum(), 0, QModelIndex())
+
+    def columnCount(self, index):
+        # pylint: disable=no-self-use, unused-argument
+        return 1
+
+    def rowCount(self, index):
+        return 0 if index.isValid() else len(self._entries)
+
+    def index(self, row_num, col_num, parent_idx):
+        if parent_idx.isValid() or col_num != 0 or not 0 <= row_num < len(self._entries):
+            return QModelIndex()
+        return self.createIndex(row_num, col_num, self._entries[row_num])
+
+    def parent(self, index):
+        # pylint: disable=no-self-use, unused-argument
+        return QModelIndex()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if isinstance(entry, GroupHeader):
+            return entry.label if role == Qt.DisplayRole else None
+        return entry.data(role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return self._entries[index.row()].flags
+
+    def isGroupHeader(self, index):
+        return index.isValid() and isinstance(self._entries[index.row()], GroupHeader)
+
+    def entry(self, row):
+        '''The stream (or GroupHeader) at a row.'''
+        return self._entries[row]
+
+    def groupMembers(self, row):
+        '''The streams of the group headed by a row.'''
+        return self._entries[row + 1:row + 1 + self._group_sizes[self._keys[row]]]
+
+    def groupHeaders(self, nodes):
+        '''The headers of the groups the given streams are in.'''
+        if self._group_by == GroupBy.NOTHING:
+            return set()
+        return {self._group_headers[(self._node_keys[node][0], 0)] for node in nodes}
@@ -22,8 +22,6 @@
 
 # pylint: disable=missing-docstring
 
-import re
-
 # pylint: disable=no-name-in-module
 from PyQt5.QtCore import QModelIndex
 from PyQt5.QtWidgets import (
@@ -33,6 +31,7 @@ from PyQt5.QtWidgets import (
     QTextEdit,
 )
 
+from ..sdp import parse_sdp
 from .node import StreamDataRole, StreamDirection
 from .stream_edit_dialog import StreamEditDialog
 from .ui import GroupHeader
@@ -130,7 +129,7 @@ class SinkEditDialog(StreamEditDialog):
             sdp = source.data(StreamDataRole.SDP)
             if not sdp:
                 continue
-            name = re.search(r's=(.*)\n', sdp).group(1)
+            name = parse_sdp(sdp).session_name or source.data(StreamDataRole.NAME)
             self._sdp_sources.addItem(name, sdp)
 
     def clear(self):
@@ -22,8 +22,6 @@
 
 # pylint: disable=missing-docstring
 
-import requests
-
 # pylint: disable=no-name-in-module
 from PyQt5.QtWidgets import (
     QDialog,
@@ -33,7 +31,6 @@ from PyQt5.QtWidgets import (
     QSpinBox,
 )
 
-from ..util import make_api_put_request
 from .node import StreamDirection
 from .ui import GroupHeader
 
@@ -113,15 +110,16 @@ class StreamEditDialog(QDialog):
         else:
             stream_id = max(self.parent().local_stream_ids()) + 1
 
-        reply = make_api_put_request(
-            requests,
-            self._plugin.address,
+        reply = self._plugin.transport.put(
             'sink_edit' if self._direction == StreamDirection.SINK else 'source_edit',
             stream_id,
             self.serialise()
         )
 
         if reply:
+            if self._direction == StreamDirection.SINK:
+                # Watch closely whilst the daemon sets the sink up
+                self._plugin.poller.burst_sink(stream_id)
             self.close()
         else:
             # todo: Implement error checking/messages
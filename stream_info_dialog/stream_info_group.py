@@ -22,12 +22,12 @@
 
 # pylint: disable=missing-docstring
 
-import requests
-
 # pylint: disable=no-name-in-module
 from PyQt5.QtWidgets import (
+    QComboBox,
     QGridLayout,
     QGroupBox,
+    QLineEdit,
     QListView,
     QMessageBox,
     QPushButton,
@@ -35,10 +35,10 @@ from PyQt5.QtWidgets import (
 
 from lisp.ui.icons import IconTheme
 
-from ..util import make_api_delete_request
 from .delegate import StreamInfoDelegate
 from .model import StreamInfoModelTemplate
 from .node import StreamDataRole, StreamDirection
+from .proxy import GroupBy, StreamFilterProxyModel, StreamSortProxyModel, source_index
 from .sink_edit_dialog import SinkEditDialog
 from .source_edit_dialog import SourceEditDialog
 
@@ -51,41 +51,69 @@ class StreamInfoGroup(QGroupBox):
         self._stream_direction = stream_direction
 
         self._model = StreamInfoModelTemplate(self._plugin, self._stream_direction)
+        # Filtering above sorting, so that changing the filter leaves the sorted rows be
+        self._sort_model = StreamSortProxyModel()
+        self._sort_model.setSourceModel(self._model)
+        self._filter_model = StreamFilterProxyModel()
+        self._filter_model.setSourceModel(self._sort_model)
         self._edit_dialog = None
         self._view_delegate = StreamInfoDelegate()
 
         self.setLayout(QGridLayout())
 
+        self._filter_box = QLineEdit()
+        self._filter_box.setClearButtonEnabled(True)
+        self._filter_box.textChanged.connect(self._filter_model.setFilterText)
+        self.layout().addWidget(self._filter_box, 0, 0, 1, 2)
+
+        self._group_by = QComboBox()
+        for group_by in GroupBy:
+            if group_by != GroupBy.LOCATION or stream_direction == StreamDirection.SOURCE:
+                self._group_by.addItem("", group_by)
+        self._group_by.currentIndexChanged.connect(self._on_group_by_select)
+        self.layout().addWidget(self._group_by, 0, 2)
+
         self._list_view = QListView()
         self._list_view.setItemDelegate(self._view_delegate)
-        self._list_view.setModel(self._model)
+        self._list_view.setModel(self._filter_model)
+        self._view_delegate.watch(self._model)
         self._list_view.setSpacing(self._view_delegate.margin)
         self._list_view.setUniformItemSizes(True)
         self._list_view.selectionModel().selectionChanged.connect(self._on_list_select)
-        self.layout().addWidget(self._list_view, 0, 0, 1, 3)
+        self.layout().addWidget(self._list_view, 1, 0, 1, 3)
 
         self._create_button = QPushButton(parent=self)
         self._create_button.setDisabled(True)
         self._create_button.setIcon(IconTheme.get("list-add"))
         self._create_button.pressed.connect(self._create_stream)
-        self.layout().addWidget(self._create_button, 1, 0)
+        self.layout().addWidget(self._create_button, 2, 0)
 
         self._edit_button = QPushButton(parent=self)
         self._edit_button.setDisabled(True)
         self._edit_button.setIcon(IconTheme.get("applications-accessories"))
         self._edit_button.pressed.connect(self._edit_stream)
-        self.layout().addWidget(self._edit_button, 1, 1)
+        self.layout().addWidget(self._edit_button, 2, 1)
 
         self._delete_button = QPushButton(parent=self)
         self._delete_button.setDisabled(True)
         self._delete_button.setIcon(IconTheme.get("list-remove"))
         self._delete_button.pressed.connect(self._delete_stream)
-        self.layout().addWidget(self._delete_button, 1, 2)
+        self.layout().addWidget(self._delete_button, 2, 2)
 
         self.translate()
 
     def translate(self):
         # todo: Mark for Translation
+        self._filter_box.setPlaceholderText("Filter by name, host, address or codec")
+        group_by_labels = {
+            GroupBy.NOTHING: "Ungrouped",
+            GroupBy.DEVICE: "Group by Device",
+            GroupBy.SUBNET: "Group by Subnet",
+            GroupBy.FORMAT: "Group by Format",
+            GroupBy.LOCATION: "Local / Remote",
+        }
+        for idx in range(self._group_by.count()):
+            self._group_by.setItemText(idx, group_by_labels[self._group_by.itemData(idx)])
         self._create_button.setText("New")
         self._edit_button.setText("Edit")
         self._delete_button.setText("Delete")
@@ -98,6 +126,10 @@ class StreamInfoGroup(QGroupBox):
         else:
             self._edit_dialog = SourceEditDialog(self._plugin, parent=self)
 
+    def _current_index(self):
+        '''The index, in the (unfiltered) model, of the currently selected stream.'''
+        return source_index(self._list_view.selectionModel().currentIndex())
+
     def _create_stream(self):
         if not self._edit_dialog:
             self._init_edit_dialog()
@@ -105,7 +137,7 @@ class StreamInfoGroup(QGroupBox):
         self._edit_dialog.exec()
 
     def _edit_stream(self):
-        idx = self._list_view.selectionModel().currentIndex()
+        idx = self._current_index()
         if not idx.isValid() or not self._model.data(idx, StreamDataRole.IS_LOCAL):
             self._edit_button.setEnabled(False)
             self._delete_button.setEnabled(False)
@@ -120,7 +152,7 @@ class StreamInfoGroup(QGroupBox):
         self._edit_dialog.exec()
 
     def _delete_stream(self):
-        idx = self._list_view.selectionModel().currentIndex()
+        idx = self._current_index()
         if not idx.isValid() or not self._model.data(idx, StreamDataRole.IS_LOCAL):
             self._edit_button.setEnabled(False)
             self._delete_button.setEnabled(False)
@@ -141,13 +173,14 @@ class StreamInfoGroup(QGroupBox):
             message.setWindowTitle("Deleting Audio Source")
 
         if message.exec() & QMessageBox.Yes:
-            make_api_delete_request(
-                requests, self._plugin.address, 'source_edit', self._model.streamId(idx)
-            )
+            self._plugin.transport.delete('source_edit', self._model.streamId(idx))
+
+    def _on_group_by_select(self, _):
+        self._sort_model.setGroupBy(self._group_by.currentData())
 
     def _on_list_select(self, _):
-        idx = self._list_view.selectionModel().currentIndex()
-        is_local = self._model.data(idx, StreamDataRole.IS_LOCAL)
+        idx = self._current_index()
+        is_local = bool(self._model.data(idx, StreamDataRole.IS_LOCAL))
         self._edit_button.setEnabled(is_local)
         self._delete_button.setEnabled(is_local)
 
@@ -169,3 +202,6 @@ class StreamInfoGroup(QGroupBox):
 
     def update_remote_streams(self, stream_definitions):
         self._model.updateRemoteStreamsFromDaemon(stream_definitions)
+
+    def update_daemon_name(self):
+        self._model.updateDaemonName()
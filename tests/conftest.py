@@ -0,0 +1,125 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Shared set-up for the tests: as for the benchmarks, the checkout is loaded as
+the `aes67_monitor` package, with LiSP stubbed if it isn't installed.
+
+Usage: python -m pytest tests
+'''
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+# pylint: disable=wrong-import-position
+from harness import load_package
+
+load_package()
+
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import QApplication
+
+from fixtures import make_sinks
+from load_test import LoadTestPlugin, load_config
+
+from aes67_monitor.state import freeze
+from aes67_monitor.status_bar.indicator import StatusBarIndicator
+from aes67_monitor.status_bar.sink_flags import SinkFlagTracker
+from aes67_monitor.status_bar.widget import StatusBarWidget
+
+# How far the clock moves between polls (in seconds): the default polling interval
+POLL_INTERVAL = 2
+
+
+class Clock:
+    '''A stand-in for `time.monotonic`, that only moves when told to.'''
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class Monitored:
+    '''
+    A poller that never polls by itself, with an indicator subscribed to it
+    (and the clock of its flag tracker under the test's control).
+
+    `poll` does what a run of the poll engine would, with the daemon replying
+    with the given bodies.
+    '''
+
+    def __init__(self, sink_count=1):
+        self.now = 1000.0
+        self.plugin = LoadTestPlugin('http://127.0.0.1:1/', load_config())
+        self.indicator = StatusBarIndicator(self.plugin)
+        self.indicator._widget = StatusBarWidget() # pylint: disable=protected-access
+        self.indicator._sink_flags = SinkFlagTracker(clock=lambda: self.now) # pylint: disable=protected-access
+
+        # As `show` does, but without starting the poller's clock
+        state = self.plugin.state
+        state.subscribe('ptp_status', self.indicator.update_ptp)
+        state.subscribe('streams', self.indicator.update_sink_names)
+        state.subscribe('sink_status', self.indicator.update_sinks)
+        self.plugin.poller.add_poll_callback('sink_status', self.indicator.sinks_polled)
+        state.update({'streams': freeze({'sinks': make_sinks(sink_count), 'sources': []})})
+
+    @property
+    def sink_flags(self):
+        return self.indicator._sink_flags # pylint: disable=protected-access
+
+    @property
+    def widget(self):
+        return self.indicator._widget # pylint: disable=protected-access
+
+    def poll(self, **bodies):
+        self.now += POLL_INTERVAL
+        poller = self.plugin.poller
+        for what, body in bodies.items():
+            if what == 'sink_status':
+                poller.sink_ids_to_poll()
+            poller.deliver(what, poller.next_sequence(), body)
+        poller._delivery.flush() # pylint: disable=protected-access
+        QApplication.processEvents()
+
+    def close(self):
+        self.plugin.close()
+
+
+@pytest.fixture(scope='session')
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def monitored(app): # pylint: disable=redefined-outer-name, unused-argument
+    monitored = Monitored() # pylint: disable=redefined-outer-name
+    yield monitored
+    monitored.close()
@@ -0,0 +1,119 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests of the circuit breaker's cycle: closed, open, half-open and closed again.
+'''
+
+from conftest import Clock
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.breaker import BreakerState, CircuitBreaker
+
+
+def make_breaker(clock, **kwargs):
+    return CircuitBreaker('test', jitter=0, clock=clock, **kwargs)
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        assert breaker.allow_request()
+        breaker.record(False)
+
+def test_opens_after_threshold():
+    breaker = make_breaker(Clock(), failure_threshold=3)
+    fail(breaker, 2)
+    assert breaker.state == BreakerState.CLOSED
+
+    fail(breaker)
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow_request()
+
+def test_success_resets_failure_count():
+    breaker = make_breaker(Clock(), failure_threshold=3)
+    fail(breaker, 2)
+    assert breaker.allow_request()
+    breaker.record(True)
+    fail(breaker, 2)
+
+    assert breaker.state == BreakerState.CLOSED
+
+def test_single_probe_once_delay_has_passed():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1, base_delay=1.0)
+    fail(breaker)
+
+    clock.advance(0.9)
+    assert not breaker.allow_request()
+
+    clock.advance(0.1)
+    assert breaker.allow_request()
+    assert breaker.state == BreakerState.HALF_OPEN
+    # Only the one probe, however many ask
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record(True)
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+def test_failed_probe_doubles_delay_up_to_cap():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1, base_delay=1.0, max_delay=5.0)
+    fail(breaker)
+
+    for delay in (1, 2, 4, 5, 5):
+        clock.advance(delay - 0.01)
+        assert not breaker.allow_request()
+        clock.advance(0.01)
+        fail(breaker)
+        assert breaker.state == BreakerState.OPEN
+
+def test_close_resets_delay():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1, base_delay=1.0)
+    fail(breaker)
+    clock.advance(1)
+    fail(breaker)
+    clock.advance(2)
+    assert breaker.allow_request()
+    breaker.record(True)
+
+    fail(breaker)
+    clock.advance(1)
+    assert breaker.allow_request()
+
+def test_late_failure_whilst_open_is_ignored():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=2, base_delay=1.0)
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == BreakerState.OPEN
+
+    # Already in flight when the breaker opened: doesn't push the retry back
+    breaker.record(False)
+    clock.advance(1)
+    assert breaker.allow_request()
@@ -0,0 +1,59 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Tests of the status bar indicator's icons, as the poller's results come in.
+'''
+
+import json
+
+from fixtures import make_sink_status
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.util import StatusEnum
+
+# pylint: disable=protected-access
+
+PTP_LOCKED = json.dumps({'status': 'locked', 'gmid': '00-1D-C1-FF-FE-12-34-56', 'jitter': 0}).encode()
+SINK_OK = {0: json.dumps(make_sink_status()).encode()}
+
+
+def test_failed_ptp_poll_leaves_sinks_icon(monitored):
+    monitored.poll(ptp_status=PTP_LOCKED, sink_status=SINK_OK)
+    monitored.poll(ptp_status=None)
+    assert monitored.widget._ptp_icon._status == StatusEnum.UNKNOWN
+    assert monitored.widget._sinks_icon._status == StatusEnum.NORMAL
+
+    for _ in range(5):
+        monitored.poll(ptp_status=PTP_LOCKED, sink_status=SINK_OK)
+    assert monitored.widget._ptp_icon._status == StatusEnum.NORMAL
+    assert monitored.widget._sinks_icon._status == StatusEnum.NORMAL
+
+def test_unreachable_daemon_clears_both_icons(monitored):
+    monitored.poll(ptp_status=PTP_LOCKED, sink_status=SINK_OK)
+    monitored.poll(ptp_status=None, sink_status=None)
+    assert monitored.widget._ptp_icon._status == StatusEnum.UNKNOWN
+    assert monitored.widget._sinks_icon._status == StatusEnum.UNKNOWN
+
+    monitored.poll(ptp_status=PTP_LOCKED, sink_status=SINK_OK)
+    assert monitored.widget._sinks_icon._status == StatusEnum.NORMAL
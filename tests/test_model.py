@@ -0,0 +1,103 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests that local sources get the SDP they're advertised with, whichever of the
+daemon's replies arrives first: each is only delivered when it changes.
+'''
+
+from fixtures import (
+    LOCAL_ADDRESS,
+    LOCAL_DAEMON_NAME,
+    StubPlugin,
+    make_local_sources,
+    make_remote_sources,
+    make_sdp,
+)
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDataRole, StreamDirection
+
+
+def advertised(local_sources, daemon_name=LOCAL_DAEMON_NAME):
+    '''The remote sources' entries for local sources, as the daemon lists them.'''
+    return [
+        {
+            **remote,
+            'name': f"{daemon_name} {local['name']}",
+            'address': LOCAL_ADDRESS,
+            'sdp': make_sdp(1000 + local['id']),
+        } for local, remote in zip(local_sources, make_remote_sources(len(local_sources), offset=1000))
+    ]
+
+def sdps(model):
+    return {node.data(StreamDataRole.NAME): node.data(StreamDataRole.SDP) for node in model}
+
+def make_model(plugin=None):
+    return StreamInfoModelTemplate(plugin or StubPlugin(), StreamDirection.SOURCE)
+
+def test_local_sources_first(app): # pylint: disable=unused-argument
+    model = make_model()
+    local = make_local_sources(2)
+    model.updateLocalStreamsFromDaemon(local)
+    model.updateRemoteStreamsFromDaemon(advertised(local) + make_remote_sources(1))
+
+    assert sdps(model)['Source 1'] == make_sdp(1001)
+    assert len(model) == 3
+
+def test_remote_sources_first(app): # pylint: disable=unused-argument
+    model = make_model()
+    local = make_local_sources(2)
+    model.updateLocalStreamsFromDaemon(local[:1])
+    model.updateRemoteStreamsFromDaemon(advertised(local))
+    assert sdps(model)['Source 0'] == make_sdp(1000)
+
+    # The remote sources aren't delivered again: they haven't changed
+    model.updateLocalStreamsFromDaemon(local)
+    assert sdps(model)['Source 1'] == make_sdp(1001)
+
+def test_renamed_local_source(app): # pylint: disable=unused-argument
+    model = make_model()
+    local = make_local_sources(1)
+    model.updateLocalStreamsFromDaemon(local)
+    renamed = [{**local[0], 'name': "Renamed"}]
+    model.updateRemoteStreamsFromDaemon(advertised(renamed))
+    assert sdps(model)['Source 0'] is None
+
+    model.updateLocalStreamsFromDaemon(renamed)
+    assert sdps(model)['Renamed'] == make_sdp(1000)
+
+def test_daemon_name_known_late(app): # pylint: disable=unused-argument
+    plugin = StubPlugin()
+    plugin.daemon_name = None
+    model = make_model(plugin)
+    local = make_local_sources(1)
+    model.updateLocalStreamsFromDaemon(local)
+    model.updateRemoteStreamsFromDaemon(advertised(local))
+    assert sdps(model)['Source 0'] is None
+
+    plugin.daemon_name = LOCAL_DAEMON_NAME
+    model.updateDaemonName()
+    assert sdps(model)['Source 0'] == make_sdp(1000)
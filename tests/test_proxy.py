@@ -0,0 +1,204 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests of the stream list's proxies, as a stream group stacks them: a filter
+above a sort. Random changes are made to the model beneath them, and after each
+the rows shown are compared with those of a brute-force sort and filter; all
+the while Qt's model tester checks that each model keeps its contract.
+'''
+
+import random
+
+import pytest
+
+from fixtures import (
+    LOCAL_ADDRESS,
+    LOCAL_DAEMON_NAME,
+    StubPlugin,
+    make_local_sources,
+    make_remote_sources,
+    make_sdp,
+)
+
+# pylint: disable=wrong-import-position, no-name-in-module
+from PyQt5.QtCore import QModelIndex, QtMsgType, qInstallMessageHandler
+from PyQt5.QtTest import QAbstractItemModelTester
+
+from aes67_monitor.stream_info_dialog import proxy
+from aes67_monitor.stream_info_dialog.model import StreamInfoModelTemplate
+from aes67_monitor.stream_info_dialog.node import StreamDataRole, StreamDirection
+from aes67_monitor.stream_info_dialog.proxy import (
+    GroupBy,
+    GroupHeader,
+    StreamFilterProxyModel,
+    StreamSortProxyModel,
+    group_of,
+    searchable_text,
+)
+
+# pylint: disable=redefined-outer-name
+
+STEPS = 300
+
+# Lowered, so that rows are re-sorted in bulk without the model growing large (which the model tester, walking
+# every row at each change, would be slow with)
+BULK_ROW_COUNT = 8
+FILTER_TEXTS = ('', 'stream', 'stream 3', 'device-1', 'source', 's', 'l24', '239.0.', '10.0.0.1', 'nothing here')
+
+
+class Streams:
+    '''The daemon's lists of streams, changed at random.'''
+
+    def __init__(self, rng):
+        self._rng = rng
+        self._next_index = 0
+        self.local = []
+        self.remote = []
+        self.advertised = {}
+
+    def _new_index(self, count):
+        first = self._next_index
+        self._next_index += count
+        return first
+
+    def _rename(self, definition):
+        return {**definition, 'name': f"{self._rng.choice(('Device', 'Source', 'Stream'))}-{self._rng.randrange(20)}"}
+
+    def _resdp(self, definition):
+        return {**definition, 'sdp': make_sdp(self._rng.randrange(600), channels=self._rng.choice((1, 2, 8)))}
+
+    def change_local(self):
+        rng = self._rng
+        action = rng.choice(('insert', 'remove', 'rename'))
+        if action == 'insert' or not self.local:
+            self.local += make_local_sources(rng.randint(1, 5), offset=self._new_index(5))
+        elif action == 'remove':
+            del self.local[rng.randrange(len(self.local))]
+        else:
+            row = rng.randrange(len(self.local))
+            self.local[row] = self._rename(self.local[row])
+
+    def change_remote(self):
+        rng = self._rng
+        action = rng.choice(('insert', 'insert_bulk', 'remove', 'remove_bulk', 'rename', 'sdp', 'advertise'))
+        if action == 'insert' or not self.remote:
+            self.remote += make_remote_sources(rng.randint(1, 5), offset=self._new_index(5))
+        elif action == 'insert_bulk' and len(self.remote) < 4 * BULK_ROW_COUNT:
+            self.remote += make_remote_sources(BULK_ROW_COUNT + 1, offset=self._new_index(BULK_ROW_COUNT + 1))
+        elif action in ('insert_bulk', 'remove'):
+            del self.remote[rng.randrange(len(self.remote))]
+        elif action == 'remove_bulk':
+            self.remote = self.remote[:len(self.remote) // 4]
+        elif action == 'rename':
+            row = rng.randrange(len(self.remote))
+            self.remote[row] = self._rename(self.remote[row])
+        elif action == 'sdp':
+            row = rng.randrange(len(self.remote))
+            self.remote[row] = self._resdp(self.remote[row])
+        elif self.local:
+            # A local source, as listed with the remote ones: so given an SDP
+            local = rng.choice(self.local)
+            self.advertised[local['id']] = self._resdp({
+                'id': f"local-{local['id']}",
+                'name': f"{LOCAL_DAEMON_NAME} {local['name']}",
+                'address': LOCAL_ADDRESS,
+            })
+
+    def remote_reply(self):
+        return self.remote + list(self.advertised.values())
+
+
+def expected_rows(model, group_by, filter_text):
+    '''The streams (and group labels) that should be shown, worked out from scratch.'''
+    terms = filter_text.lower().split()
+    groups = {}
+    for node in model:
+        group_key, label = group_of(node, group_by)
+        name = node.data(StreamDataRole.NAME) or ''
+        key = (name.casefold(), str(node.data(StreamDataRole.RAW)['id']))
+        groups.setdefault((group_key, label), []).append((key, node))
+
+    rows = []
+    for (_, label), members in sorted(groups.items(), key=lambda group: group[0][0] or ()):
+        shown = [node for _, node in sorted(members, key=lambda member: member[0])
+                 if all(term in searchable_text(node) for term in terms)]
+        if shown and group_by != GroupBy.NOTHING:
+            rows.append(label)
+        rows += shown
+    return rows
+
+def shown_rows(filter_model, sort_model):
+    rows = []
+    for row in range(filter_model.rowCount(QModelIndex())):
+        entry = sort_model.entry(filter_model.mapToSource(filter_model.index(row, 0, QModelIndex())).row())
+        rows.append(entry.label if isinstance(entry, GroupHeader) else entry)
+    return rows
+
+
+@pytest.fixture
+def qt_warnings():
+    warnings = []
+
+    def handler(msg_type, _context, message):
+        if msg_type != QtMsgType.QtDebugMsg:
+            warnings.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    yield warnings
+    qInstallMessageHandler(previous)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_shown_rows_match_brute_force(app, qt_warnings, monkeypatch, seed): # pylint: disable=unused-argument
+    monkeypatch.setattr(proxy, 'BULK_ROW_COUNT', BULK_ROW_COUNT)
+    rng = random.Random(seed)
+    streams = Streams(rng)
+
+    model = StreamInfoModelTemplate(StubPlugin(), StreamDirection.SOURCE)
+    sort_model = StreamSortProxyModel()
+    sort_model.setSourceModel(model)
+    filter_model = StreamFilterProxyModel()
+    filter_model.setSourceModel(sort_model)
+    # Kept for the length of the test: they check each model as it changes
+    _testers = [
+        QAbstractItemModelTester(tested, QAbstractItemModelTester.FailureReportingMode.Warning)
+        for tested in (model, sort_model, filter_model)
+    ]
+
+    for step in range(STEPS):
+        action = rng.choice(('local', 'remote', 'remote', 'group_by', 'filter', 'filter'))
+        if action == 'local':
+            streams.change_local()
+            model.updateLocalStreamsFromDaemon(streams.local)
+        elif action == 'remote':
+            streams.change_remote()
+            model.updateRemoteStreamsFromDaemon(streams.remote_reply())
+        elif action == 'group_by':
+            sort_model.setGroupBy(rng.choice(list(GroupBy)))
+        else:
+            filter_model.setFilterText(rng.choice(FILTER_TEXTS))
+
+        expected = expected_rows(model, sort_model.groupBy(), filter_model.filterText())
+        assert shown_rows(filter_model, sort_model) == expected, f"step {step}: {action}"
+        assert not qt_warnings, f"step {step}: {action}"
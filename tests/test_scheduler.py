@@ -0,0 +1,77 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests that the poll scheduler spreads endpoints out across ticks.
+'''
+
+from functools import reduce
+from math import gcd
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.poller import POLL_RATES, TICK_INTERVAL
+from aes67_monitor.scheduler import PollPriority, PollScheduler
+
+
+def schedule_defaults(scheduler):
+    for what, (interval, priority) in POLL_RATES.items():
+        scheduler.schedule(what, interval, priority)
+
+def run(scheduler, ticks):
+    return [set(scheduler.tick()) for _ in range(ticks)]
+
+def test_default_rates_never_all_due_at_once():
+    scheduler = PollScheduler(TICK_INTERVAL)
+    schedule_defaults(scheduler)
+    periods = [interval // TICK_INTERVAL for interval, _ in POLL_RATES.values()]
+    cycle = reduce(lambda a, b: a * b // gcd(a, b), periods)
+
+    ticks = run(scheduler, 2 * cycle)
+    assert all(due != set(POLL_RATES) for due in ticks)
+
+    # Each is still polled at its own rate
+    for what, (interval, _) in POLL_RATES.items():
+        assert sum(what in due for due in ticks) == 2 * cycle * TICK_INTERVAL // interval
+
+    # Those that can be kept apart are: the two polled at the same rate never share a tick
+    assert not any({'streams', 'sink_status'} <= due for due in ticks)
+
+def test_new_endpoint_due_on_next_tick():
+    scheduler = PollScheduler(TICK_INTERVAL)
+    scheduler.schedule('config', 10000, PollPriority.LOW)
+    run(scheduler, 7)
+
+    scheduler.schedule('streams', 2000, PollPriority.NORMAL)
+    assert scheduler.tick() == ['streams']
+
+def test_new_endpoint_among_defaults_due_within_two_ticks():
+    # PTP status, polled every other tick, collides with any endpoint of an even period: so of the next two
+    # ticks, the one with least else due is taken
+    for ticks_run in range(8):
+        scheduler = PollScheduler(TICK_INTERVAL)
+        schedule_defaults(scheduler)
+        run(scheduler, ticks_run)
+
+        scheduler.schedule('new', 4000, PollPriority.NORMAL)
+        assert any('new' in due for due in run(scheduler, 2))
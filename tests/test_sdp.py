@@ -0,0 +1,98 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests of the parsing of Session Descriptions.
+'''
+
+from fixtures import make_sdp
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.sdp import SdpConnection, SdpOrigin, SdpRtpMap, parse_sdp
+
+
+def with_line(prefix, line, sdp=None):
+    '''An SDP with the first line starting with `prefix` replaced by `line`.'''
+    lines = (sdp or make_sdp(1)).splitlines()
+    row = next(row for row, text in enumerate(lines) if text.startswith(prefix))
+    lines[row] = line
+    return '\n'.join(lines) + '\n'
+
+def test_fields():
+    session = parse_sdp(make_sdp(1, channels=8))
+
+    assert session.session_name == "Device-1 : Stream 1"
+    assert session.origin == SdpOrigin('-', '1', '0', 'IN', 'IP4', '10.0.0.2')
+    assert session.rtpmap == SdpRtpMap(98, 'L24', 48000, 8)
+    assert session.ptime == 1.0
+    assert session.ts_refclk == "ptp=IEEE1588-2008:00-1D-C1-FF-FE-12-34-56:0"
+    assert session.mediaclk == "direct=0"
+
+def test_crlf_line_endings():
+    sdp = make_sdp(1)
+    assert parse_sdp(sdp.replace('\n', '\r\n')) == parse_sdp(sdp)
+    assert parse_sdp(sdp.replace('\n', '\r\n')).session_name == "Device-1 : Stream 1"
+
+def test_missing_fields_are_none():
+    session = parse_sdp("v=0\n")
+    assert session == (None,) * len(session)
+
+def test_rtpmap_channels_default_to_one():
+    assert parse_sdp(with_line('a=rtpmap:', 'a=rtpmap:98 L24/48000')).rtpmap == SdpRtpMap(98, 'L24', 48000, 1)
+
+def test_malformed_rtpmap_is_none():
+    for line in ('a=rtpmap:98', 'a=rtpmap:x L24/48000/2', 'a=rtpmap:98 L24', 'a=rtpmap:98 L24/fast/2'):
+        assert parse_sdp(with_line('a=rtpmap:', line)).rtpmap is None, line
+
+def test_malformed_ptime_is_none():
+    assert parse_sdp(with_line('a=ptime:', 'a=ptime:0.125')).ptime == 0.125
+    assert parse_sdp(with_line('a=ptime:', 'a=ptime:short')).ptime is None
+
+def test_session_connection_wins_over_media():
+    # The session-level c= line comes before the media section's
+    assert parse_sdp(make_sdp(1)).connection.address == '239.0.1.1'
+
+    sdp = with_line('c=', 'c=IN IP4 239.1.2.3')
+    assert parse_sdp(sdp).connection == SdpConnection('IN', 'IP4', '239.1.2.3', None)
+
+def test_connection_ttl_and_address_count():
+    assert parse_sdp(with_line('c=', 'c=IN IP4 239.1.2.3/15')).connection == \
+        SdpConnection('IN', 'IP4', '239.1.2.3', 15)
+    assert parse_sdp(with_line('c=', 'c=IN IP4 239.1.2.3/32/4')).connection == \
+        SdpConnection('IN', 'IP4', '239.1.2.3', 32)
+
+    # IPv6 multicast addresses have no TTL, only a number of addresses
+    assert parse_sdp(with_line('c=', 'c=IN IP6 ff15::101/3')).connection == \
+        SdpConnection('IN', 'IP6', 'ff15::101', None)
+
+def test_malformed_connection_is_none():
+    assert parse_sdp(with_line('c=', 'c=IN IP4')).connection is None
+
+def test_cached():
+    sdp = make_sdp(1)
+    # An equal string, but not the same one
+    copy = ''.join(list(sdp))
+    assert copy is not sdp
+
+    assert parse_sdp(copy) is parse_sdp(sdp)
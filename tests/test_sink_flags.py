@@ -0,0 +1,67 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Tests that sink flags are raised and lowered as they should be, when fed by
+the poller: which only passes a sink's status on when it has changed.
+'''
+
+import json
+
+from conftest import POLL_INTERVAL
+from fixtures import make_sink_status
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.status_bar.sink_flags import LOWER_AFTER
+from aes67_monitor.util import StatusEnum
+
+SINK_ID = 0
+ERROR = {SINK_ID: json.dumps(make_sink_status(errors=('rtp_ssrc_error',))).encode()}
+CLEARED = {SINK_ID: json.dumps(make_sink_status()).encode()}
+
+
+def test_error_is_raised_at_once(monitored):
+    monitored.poll(sink_status=ERROR)
+
+    assert 'rtp_ssrc_error' in monitored.sink_flags.raised_flags(SINK_ID)
+    assert monitored.sink_flags.severity() == StatusEnum.ERROR
+
+def test_error_cleared_once_then_polled_steadily_is_lowered(monitored):
+    for bodies in (ERROR, ERROR, CLEARED):
+        monitored.poll(sink_status=bodies)
+    assert monitored.sink_flags.severity() == StatusEnum.ERROR
+
+    # Identical replies, that the poller doesn't pass on
+    for _ in range(LOWER_AFTER // POLL_INTERVAL + 1):
+        monitored.poll(sink_status=CLEARED)
+
+    assert 'rtp_ssrc_error' not in monitored.sink_flags.raised_flags(SINK_ID)
+    assert monitored.sink_flags.severity() == StatusEnum.NORMAL
+    assert monitored.sink_flags.counts(SINK_ID, 'rtp_ssrc_error') == (1, 1)
+
+def test_error_flapping_stays_raised(monitored):
+    for bodies in (ERROR, CLEARED, ERROR, CLEARED, ERROR, CLEARED):
+        monitored.poll(sink_status=bodies)
+
+    assert monitored.sink_flags.severity() == StatusEnum.ERROR
+    assert monitored.sink_flags.counts(SINK_ID, 'rtp_ssrc_error') == (1, 0)
@@ -0,0 +1,162 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+'''
+Tests of the rates sinks' statuses are polled at: bursts, backing off whilst
+stable, and the overall budget.
+'''
+
+from conftest import Clock
+from fixtures import make_sink_status
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.sink_planner import (
+    BURST_DURATION,
+    BURST_INTERVAL,
+    MAX_STABLE_INTERVAL,
+    STABLE_AFTER,
+    SinkPollPlanner,
+)
+
+BASE_INTERVAL = 2000
+# Enough not to get in the way, except where the budget is being tested
+BUDGET = 1000
+# How far the clock is moved on at a time, in seconds
+STEP = BURST_INTERVAL / 1000
+
+OK = make_sink_status()
+ERROR = make_sink_status(errors=('rtp_ssrc_error',))
+
+
+def make_planner(clock, sink_ids=(0,), budget=BUDGET):
+    planner = SinkPollPlanner(BASE_INTERVAL, budget, clock)
+    planner.set_sinks(sink_ids)
+    return planner
+
+def wait_until_due(planner, clock, sink_id):
+    '''Moves the clock on until a sink is due, returning how long (in milliseconds) that took.'''
+    waited = 0
+    while sink_id not in planner.due():
+        clock.advance(STEP)
+        waited += BURST_INTERVAL
+        assert waited <= MAX_STABLE_INTERVAL
+    return waited
+
+def poll(planner, clock, sink_id, status, changed=False):
+    '''Waits for a sink to fall due, then records its status; returning how long the wait was.'''
+    waited = wait_until_due(planner, clock, sink_id)
+    planner.record(sink_id, changed, status)
+    return waited
+
+def test_first_sinks_are_polled_at_base_rate():
+    clock = Clock()
+    planner = make_planner(clock)
+    poll(planner, clock, 0, OK, changed=True)
+
+    assert poll(planner, clock, 0, OK) == BASE_INTERVAL
+
+def test_burst_on_error_rising_edge():
+    clock = Clock()
+    planner = make_planner(clock)
+    poll(planner, clock, 0, OK, changed=True)
+
+    assert poll(planner, clock, 0, ERROR, changed=True) == BASE_INTERVAL
+    waited = 0
+    while waited < BURST_DURATION - BURST_INTERVAL:
+        assert poll(planner, clock, 0, ERROR) == BURST_INTERVAL
+        waited += BURST_INTERVAL
+
+    # The error is still raised, but no longer new
+    assert poll(planner, clock, 0, ERROR) == BURST_INTERVAL
+    assert poll(planner, clock, 0, ERROR) == BASE_INTERVAL
+
+    # Cleared, then raised again: another rising edge
+    poll(planner, clock, 0, OK, changed=True)
+    poll(planner, clock, 0, ERROR, changed=True)
+    assert poll(planner, clock, 0, ERROR) == BURST_INTERVAL
+
+def test_burst_on_create():
+    clock = Clock()
+    planner = make_planner(clock)
+    planner.set_sinks((0, 1))
+
+    assert poll(planner, clock, 1, OK, changed=True) == 0
+    assert poll(planner, clock, 1, OK) == BURST_INTERVAL
+
+def test_burst_on_edit():
+    clock = Clock()
+    planner = make_planner(clock)
+    poll(planner, clock, 0, OK, changed=True)
+    planner.burst(0)
+
+    assert poll(planner, clock, 0, OK, changed=True) == 0
+    assert poll(planner, clock, 0, OK) == BURST_INTERVAL
+
+def test_stable_interval_doubles_up_to_cap():
+    clock = Clock()
+    planner = make_planner(clock)
+    poll(planner, clock, 0, OK, changed=True)
+
+    stable_for = 0
+    while stable_for < STABLE_AFTER:
+        stable_for += poll(planner, clock, 0, OK)
+
+    intervals = [poll(planner, clock, 0, OK) for _ in range(5)]
+    assert intervals == [BASE_INTERVAL * 2, BASE_INTERVAL * 4, MAX_STABLE_INTERVAL, MAX_STABLE_INTERVAL,
+                         MAX_STABLE_INTERVAL]
+
+    # A change puts it back to the base rate
+    poll(planner, clock, 0, OK, changed=True)
+    assert poll(planner, clock, 0, OK) == BASE_INTERVAL
+
+def test_budget_limits_requests_per_second():
+    clock = Clock()
+    planner = make_planner(clock, sink_ids=range(20), budget=5)
+
+    polled = []
+    for _ in range(int(4 / STEP)):
+        due = planner.due()
+        for sink_id in due:
+            planner.record(sink_id, False, OK)
+        polled.append(due)
+        clock.advance(STEP)
+
+    # A second's worth to start with, then no more than the budget each second
+    assert len(polled[0]) == 5
+    per_second = int(1 / STEP)
+    for first in range(per_second, len(polled), per_second):
+        assert sum(len(due) for due in polled[first:first + per_second]) <= 5
+
+    # Those held back are polled later, rather than never
+    assert {sink_id for due in polled for sink_id in due} == set(range(20))
+
+def test_bursting_sinks_served_first():
+    clock = Clock()
+    planner = make_planner(clock, sink_ids=range(10), budget=3)
+    planner.burst(8)
+    planner.burst(9)
+
+    due = planner.due()
+    assert len(due) == 3
+    assert {8, 9} <= set(due)
@@ -0,0 +1,109 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+
+'''
+Tests of which requests count towards the transport's circuit breaker.
+'''
+
+import socketserver
+from threading import Thread
+
+import pytest
+
+from conftest import Clock
+from fixtures import make_sinks
+from load_test import LoadTestPlugin, load_config
+from mock_daemon import MockDaemon
+
+# pylint: disable=wrong-import-position
+from aes67_monitor.breaker import BreakerState, CircuitBreaker
+
+# pylint: disable=redefined-outer-name
+
+UNREACHABLE = 'http://127.0.0.1:1/'
+
+
+@pytest.fixture
+def mock_daemon():
+    daemon = MockDaemon(remote_sources=0, local_sources=0, sinks=1).start()
+    yield daemon
+    daemon.stop()
+
+class TruncatingHandler(socketserver.BaseRequestHandler):
+    '''Promises a body of 100 bytes, then hangs up after a few.'''
+
+    def handle(self):
+        self.request.recv(65536)
+        self.request.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{"a"')
+
+@pytest.fixture
+def truncating_address():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), TruncatingHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+def test_invalid_requests_leave_breaker_closed(app): # pylint: disable=unused-argument
+    plugin = LoadTestPlugin(UNREACHABLE, load_config())
+    transport = plugin.transport
+    for _ in range(5):
+        assert transport.put('sink_edit', None, {'name': "Sink"}) is None
+        assert transport.put('sink_edit', 1, {}) is None
+        assert transport.delete('sink_edit', None) is None
+        assert transport.get('no_such_endpoint') is None
+
+    assert transport.breaker.state == BreakerState.CLOSED
+    assert transport.stats()['failures'] == 0
+    plugin.close()
+
+def test_stream_id_zero_is_edited(app, mock_daemon): # pylint: disable=unused-argument
+    plugin = LoadTestPlugin(mock_daemon.address, load_config(daemon_port=mock_daemon.port))
+    definition = {**make_sinks(1)[0], 'name': "Renamed"}
+
+    reply = plugin.transport.put('sink_edit', 0, definition)
+    assert reply is not None and reply.status_code == 200
+    assert mock_daemon.stats()['PUT api/sink/'] == 1
+
+    reply = plugin.transport.delete('sink_edit', 0)
+    assert reply is not None and reply.status_code == 200
+    plugin.close()
+
+def test_truncated_reply_is_recorded_as_failure(app, truncating_address): # pylint: disable=unused-argument
+    clock = Clock()
+    plugin = LoadTestPlugin(truncating_address, load_config())
+    transport = plugin.transport
+    breaker = CircuitBreaker(truncating_address, failure_threshold=1, jitter=0, clock=clock)
+    transport._breakers[truncating_address] = breaker # pylint: disable=protected-access
+
+    assert transport.get('config') is None
+    assert breaker.state == BreakerState.OPEN
+
+    # The probe fails the same way: the breaker must reopen, not wait on it forever
+    clock.advance(1)
+    assert transport.get_many('sink_status', (0, 1)) == {0: None, 1: None}
+    assert breaker.state == BreakerState.OPEN
+    clock.advance(2)
+    assert breaker.allow_request()
+    plugin.close()
@@ -0,0 +1,184 @@
+# This file is a derivation of work on - and as such shares the same
+# licence as - Linux Show Player
+#
+# Linux Show Player:
+#   Copyright 2012-2022 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# This file:
+#   Copyright 2022 s0600204
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=missing-docstring
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .breaker import CircuitBreaker
+from .util import (
+    API_PATHS,
+    make_api_delete_request,
+    make_api_get_request,
+    make_api_put_request,
+)
+
+
+class DaemonTransport:
+    '''
+    A single, long-lived, connection to the AES67 Daemon.
+
+    All requests to the daemon should be made through here, so that they share
+    the same pool of keep-alive connections, timeouts and retry policy.
+
+    Each daemon address has its own circuit breaker: whilst it is open,
+    requests fail immediately (returning None) instead of being attempted.
+    '''
+
+    # Connections kept in the pool on top of those used by concurrent requests
+    SPARE_CONNECTIONS = 2
+
+    def __init__(self, plugin):
+        self._plugin = plugin
+        config = plugin.Config
+
+        self._timeout = (config['connect_timeout'], config['read_timeout'])
+        concurrency = config['request_concurrency']
+
+        retries = Retry(
+            total=config['request_retries'],
+            read=0,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(('GET', 'PUT', 'DELETE')),
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=concurrency + self.SPARE_CONNECTIONS,
+            max_retries=retries,
+        )
+        self._session = requests.Session()
+        self._session.mount('http://', self._adapter)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix='aes67_transport'
+        )
+
+        self._breakers = {}
+        self._breakers_lock = Lock()
+
+        self._stats_lock = Lock()
+        self._request_count = 0
+        self._failure_count = 0
+        self._refused_count = 0
+
+    @property
+    def address(self):
+        return self._plugin.address
+
+    @property
+    def breaker(self):
+        '''The circuit breaker of the daemon currently being monitored.'''
+        address = self.address
+        with self._breakers_lock:
+            if address not in self._breakers:
+                self._breakers[address] = CircuitBreaker(address)
+            return self._breakers[address]
+
+    def _request(self, request_function, what, *args):
+        if what not in API_PATHS:
+            return None
+
+        breaker = self.breaker
+        if not breaker.allow_request():
+            with self._stats_lock:
+                self._refused_count += 1
+            return None
+
+        # Whatever happens, the breaker must hear back: a probe never recorded leaves it half-open for good
+        reply = None
+        try:
+            reply = request_function(self._session, self.address, what, *args, self._timeout)
+        finally:
+            breaker.record(reply is not None)
+            with self._stats_lock:
+                self._request_count += 1
+                if reply is None:
+                    self._failure_count += 1
+        return reply
+
+    def get(self, what, opt_arg=None):
+        return self._request(make_api_get_request, what, opt_arg)
+
+    def get_many(self, what, opt_args):
+        '''
+        Makes a GET request for each of the supplied arguments, concurrently.
+
+        Returns a dict mapping each argument to its reply (or to None on failure).
+        '''
+        futures = {
+            opt_arg: self._executor.submit(self.get, what, opt_arg)
+            for opt_arg in opt_args
+        }
+        return {opt_arg: future.result() for opt_arg, future in futures.items()}
+
+    # Requests that could never be made are turned away before the breaker sees them: they say nothing
+    # about whether the daemon is answering
+
+    def put(self, what, arg, json_data):
+        if arg is None or not json_data:
+            return None
+        return self._request(make_api_put_request, what, arg, json_data)
+
+    def delete(self, what, arg):
+        if arg is None:
+            return None
+        return self._request(make_api_delete_request, what, arg)
+
+    def stats(self):
+        '''Returns a snapshot of request and connection pool statistics.'''
+        opened = 0
+        pooled_requests = 0
+        idle = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            pooled_requests += pool.num_requests
+            if pool.pool:
+                # The queue is padded with `None` in place of connections not yet made
+                idle += sum(1 for conn in list(pool.pool.queue) if conn)
+
+        breaker_state = self.breaker.state
+        with self._stats_lock:
+            return {
+                'requests': self._request_count,
+                'failures': self._failure_count,
+                'refused': self._refused_count,
+                'breaker': breaker_state.name,
+                'connections_opened': opened,
+                'connections_reused': max(pooled_requests - opened, 0),
+                'connections_idle': idle,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._session.close()
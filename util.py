@@ -22,10 +22,21 @@
 
 # pylint: disable=missing-docstring
 
+import json
 from enum import Enum
 
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None # pylint: disable=invalid-name
+
+try:
+    import ujson
+except ImportError:
+    ujson = None # pylint: disable=invalid-name
+
 
 API_PATHS = {
     'config': "api/config",
@@ -37,6 +48,21 @@ API_PATHS = {
     'streams': "api/streams",
 }
 
+# Decoders that parse JSON directly from the bytes of a reply, fastest first.
+# (The standard library's will still make a decoded copy of the text internally.)
+JSON_DECODERS = {}
+if orjson:
+    JSON_DECODERS['orjson'] = orjson.loads
+if ujson:
+    JSON_DECODERS['ujson'] = ujson.loads
+JSON_DECODERS['json'] = json.loads
+
+def get_json_decoder(name=None):
+    '''Returns the named JSON decoder, or the fastest available if that isn't installed.'''
+    if name in JSON_DECODERS:
+        return JSON_DECODERS[name]
+    return next(iter(JSON_DECODERS.values()))
+
 class StatusEnum(Enum):
     DEBUG = -2
     UNKNOWN = -1
@@ -44,20 +70,64 @@ class StatusEnum(Enum):
     WARNING = 1
     ERROR = 2
 
-def make_api_get_request(session, address, what, opt_arg=None):
+# The flags of a sink's status, with the status each implies when raised
+SINK_FLAGS = {
+    "rtp_seq_id_error": {
+        'status': StatusEnum.ERROR,
+        'tooltip': "Incorrect RTP sequence",
+    },
+    "rtp_ssrc_error": {
+        'status': StatusEnum.ERROR,
+        'tooltip': "Received data from unexpected source",
+    },
+    "rtp_payload_type_error": {
+        'status': StatusEnum.ERROR,
+        'tooltip': "Unexpected payload type",
+    },
+    "rtp_sac_error": {
+        'status': StatusEnum.ERROR,
+        'tooltip': "Packet with invalid timestamp",
+    },
+    "receiving_rtp_packet": {
+        'status': StatusEnum.NORMAL,
+        'tooltip': "Receiving Audio",
+    },
+    "some_muted": {
+        'status': StatusEnum.DEBUG,
+        'tooltip': "Unused flag",
+    },
+    "all_muted": {
+        'status': StatusEnum.DEBUG,
+        'tooltip': "Unused flag",
+    },
+    "muted": {
+        'status': StatusEnum.NORMAL,
+        'tooltip': "Audio stream muted",
+    },
+}
+
+def make_api_url(address, what, opt_arg=None):
     path = API_PATHS.get(what)
     if not path:
         return None
 
+    if opt_arg is not None:
+        return f"{address}{path}{opt_arg}"
+    return f"{address}{path}"
+
+def make_api_get_request(session, address, what, opt_arg=None, timeout=None):
+    url = make_api_url(address, what, opt_arg)
+    if not url:
+        return None
+
     try:
-        if opt_arg is not None:
-            return session.get(f"{address}{path}{opt_arg}")
-        return session.get(f"{address}{path}")
-    except requests.ConnectionError:
+        return session.get(url, timeout=timeout)
+    except requests.RequestException:
         return None
 
-def make_api_put_request(session, address, what, arg, json_data):
-    if not arg or not json_data:
+def make_api_put_request(session, address, what, arg, json_data, timeout=None):
+    # (A stream's id may be 0)
+    if arg is None or not json_data:
         return None
 
     path = API_PATHS.get(what)
@@ -65,12 +135,12 @@ def make_api_put_request(session, address, what, arg, json_data):
         return None
 
     try:
-        return session.put(f"{address}{path}{arg}", json=json_data)
-    except requests.ConnectionError:
+        return session.put(f"{address}{path}{arg}", json=json_data, timeout=timeout)
+    except requests.RequestException:
         return None
 
-def make_api_delete_request(session, address, what, arg):
-    if not arg:
+def make_api_delete_request(session, address, what, arg, timeout=None):
+    if arg is None:
         return None
 
     path = API_PATHS.get(what)
@@ -78,6 +148,6 @@ def make_api_delete_request(session, address, what, arg):
         return None
 
     try:
-        return session.delete(f"{address}{path}{arg}")
-    except requests.ConnectionError:
+        return session.delete(f"{address}{path}{arg}", timeout=timeout)
+    except requests.RequestException:
         return None